@@ -0,0 +1,55 @@
+"""add (repository_id, committed_at) index on commits
+
+Revision ID: a7d3e5f90c12
+Revises: f1b6c3d82e57
+Create Date: 2026-10-16 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7d3e5f90c12"
+down_revision: Union[str, None] = "f1b6c3d82e57"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _is_postgres() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    if _is_postgres():
+        # CONCURRENTLY cannot run inside a transaction block, and keeps
+        # commits writable while the index builds.
+        with op.get_context().autocommit_block():
+            op.create_index(
+                "ix_commit_repo_time",
+                "commits",
+                ["repository_id", "committed_at"],
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+    else:
+        op.create_index(
+            "ix_commit_repo_time",
+            "commits",
+            ["repository_id", "committed_at"],
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            op.drop_index(
+                "ix_commit_repo_time",
+                table_name="commits",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+    else:
+        op.drop_index("ix_commit_repo_time", table_name="commits", if_exists=True)
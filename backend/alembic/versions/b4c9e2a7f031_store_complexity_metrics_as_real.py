@@ -0,0 +1,47 @@
+"""store commit complexity metrics as REAL
+
+Revision ID: b4c9e2a7f031
+Revises: a7d3e5f90c12
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b4c9e2a7f031"
+down_revision: Union[str, None] = "a7d3e5f90c12"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _is_postgres() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    # SQLite stores every REAL as an 8-byte float; nothing to change there.
+    if not _is_postgres():
+        return
+    # One ALTER TABLE → one rewrite and one ACCESS EXCLUSIVE acquisition.
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    op.execute(
+        "ALTER TABLE commits "
+        "ALTER COLUMN avg_cyclomatic_complexity TYPE REAL, "
+        "ALTER COLUMN max_cyclomatic_complexity TYPE REAL, "
+        "ALTER COLUMN avg_maintainability_index TYPE REAL"
+    )
+
+
+def downgrade() -> None:
+    if not _is_postgres():
+        return
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    op.execute(
+        "ALTER TABLE commits "
+        "ALTER COLUMN avg_cyclomatic_complexity TYPE DOUBLE PRECISION, "
+        "ALTER COLUMN max_cyclomatic_complexity TYPE DOUBLE PRECISION, "
+        "ALTER COLUMN avg_maintainability_index TYPE DOUBLE PRECISION"
+    )
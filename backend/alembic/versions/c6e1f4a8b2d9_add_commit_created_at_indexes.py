@@ -0,0 +1,60 @@
+"""add (created_at, id) keyset indexes on commits
+
+Revision ID: c6e1f4a8b2d9
+Revises: b4c9e2a7f031
+Create Date: 2026-10-16 15:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c6e1f4a8b2d9"
+down_revision: Union[str, None] = "b4c9e2a7f031"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_INDEXES = (
+    ("ix_commit_created", ["created_at", "id"]),
+    ("ix_commit_repo_created", ["repository_id", "created_at", "id"]),
+)
+
+
+def _is_postgres() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+def upgrade() -> None:
+    if _is_postgres():
+        # CONCURRENTLY cannot run inside a transaction block, and keeps
+        # commits writable while the indexes build.
+        with op.get_context().autocommit_block():
+            for name, columns in _INDEXES:
+                op.create_index(
+                    name,
+                    "commits",
+                    columns,
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+    else:
+        for name, columns in _INDEXES:
+            op.create_index(name, "commits", columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    if _is_postgres():
+        with op.get_context().autocommit_block():
+            for name, _ in reversed(_INDEXES):
+                op.drop_index(
+                    name,
+                    table_name="commits",
+                    postgresql_concurrently=True,
+                    if_exists=True,
+                )
+    else:
+        for name, _ in reversed(_INDEXES):
+            op.drop_index(name, table_name="commits", if_exists=True)
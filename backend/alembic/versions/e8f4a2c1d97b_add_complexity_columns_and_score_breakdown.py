@@ -18,12 +18,30 @@ branch_labels: Union[str, Sequence[str], None] = None
 depends_on: Union[str, Sequence[str], None] = None
 
 
+def _is_postgres() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
 def upgrade() -> None:
     # --- Commits: add complexity columns ---
-    op.add_column("commits", sa.Column("avg_cyclomatic_complexity", sa.Float(), nullable=True))
-    op.add_column("commits", sa.Column("max_cyclomatic_complexity", sa.Float(), nullable=True))
-    op.add_column("commits", sa.Column("avg_maintainability_index", sa.Float(), nullable=True))
-    op.add_column("commits", sa.Column("complexity_rank", sa.String(2), nullable=True))
+    if _is_postgres():
+        # One ALTER TABLE → one ACCESS EXCLUSIVE acquisition; give up quickly
+        # instead of queueing behind long-running readers.
+        op.execute("SET LOCAL lock_timeout = '5s'")
+        op.execute(
+            "ALTER TABLE commits "
+            "ADD COLUMN avg_cyclomatic_complexity FLOAT, "
+            "ADD COLUMN max_cyclomatic_complexity FLOAT, "
+            "ADD COLUMN avg_maintainability_index FLOAT, "
+            "ADD COLUMN complexity_rank VARCHAR(2)"
+        )
+    else:
+        # One batch → one table rewrite on SQLite
+        with op.batch_alter_table("commits") as batch_op:
+            batch_op.add_column(sa.Column("avg_cyclomatic_complexity", sa.Float(), nullable=True))
+            batch_op.add_column(sa.Column("max_cyclomatic_complexity", sa.Float(), nullable=True))
+            batch_op.add_column(sa.Column("avg_maintainability_index", sa.Float(), nullable=True))
+            batch_op.add_column(sa.Column("complexity_rank", sa.String(2), nullable=True))
 
     # --- RiskAssessments: add score_breakdown_json, update default model_version ---
     op.add_column("risk_assessments", sa.Column("score_breakdown_json", sa.Text(), nullable=True))
@@ -31,7 +49,18 @@ def upgrade() -> None:
 
 def downgrade() -> None:
     op.drop_column("risk_assessments", "score_breakdown_json")
-    op.drop_column("commits", "complexity_rank")
-    op.drop_column("commits", "avg_maintainability_index")
-    op.drop_column("commits", "max_cyclomatic_complexity")
-    op.drop_column("commits", "avg_cyclomatic_complexity")
+    if _is_postgres():
+        op.execute("SET LOCAL lock_timeout = '5s'")
+        op.execute(
+            "ALTER TABLE commits "
+            "DROP COLUMN complexity_rank, "
+            "DROP COLUMN avg_maintainability_index, "
+            "DROP COLUMN max_cyclomatic_complexity, "
+            "DROP COLUMN avg_cyclomatic_complexity"
+        )
+    else:
+        with op.batch_alter_table("commits") as batch_op:
+            batch_op.drop_column("complexity_rank")
+            batch_op.drop_column("avg_maintainability_index")
+            batch_op.drop_column("max_cyclomatic_complexity")
+            batch_op.drop_column("avg_cyclomatic_complexity")
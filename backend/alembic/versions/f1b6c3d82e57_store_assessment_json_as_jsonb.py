@@ -0,0 +1,57 @@
+"""store assessment features / breakdown as JSONB
+
+Revision ID: f1b6c3d82e57
+Revises: e8f4a2c1d97b
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f1b6c3d82e57"
+down_revision: Union[str, None] = "e8f4a2c1d97b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _is_postgres() -> bool:
+    return op.get_bind().dialect.name == "postgresql"
+
+
+# Legacy rows were written with json.dumps, which emits the non-standard
+# NaN / Infinity / -Infinity literals that JSONB rejects.  Any such value
+# (one directly following ':', ',' or '[') is rewritten to null before the
+# cast, the same mapping CommitFeatures.to_dict now applies to new rows.
+# \y is the PostgreSQL regex word boundary.
+_NON_FINITE_TO_NULL = (
+    r"regexp_replace({col}, '([:,\[]\s*)-?(NaN|Infinity)\y', '\1null', 'g')::jsonb"
+)
+
+
+def upgrade() -> None:
+    # SQLite: sa.JSON is stored as TEXT, so the existing column already fits.
+    if not _is_postgres():
+        return
+    # One ALTER TABLE → one rewrite and one ACCESS EXCLUSIVE acquisition.
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    op.execute(
+        "ALTER TABLE risk_assessments "
+        "ALTER COLUMN features_json TYPE JSONB USING "
+        + _NON_FINITE_TO_NULL.format(col="features_json")
+        + ", ALTER COLUMN score_breakdown_json TYPE JSONB USING "
+        + _NON_FINITE_TO_NULL.format(col="score_breakdown_json")
+    )
+
+
+def downgrade() -> None:
+    if not _is_postgres():
+        return
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    op.execute(
+        "ALTER TABLE risk_assessments "
+        "ALTER COLUMN features_json TYPE TEXT USING features_json::text, "
+        "ALTER COLUMN score_breakdown_json TYPE TEXT USING score_breakdown_json::text"
+    )
@@ -13,19 +13,21 @@ from celery import Celery
 
 from app.config import get_settings
 
-settings = get_settings()
+REDIS_URL: str = get_settings().REDIS_URL
 
 celery = Celery(
     "risk_predictor",
-    broker=settings.REDIS_URL,
-    backend=settings.REDIS_URL,
+    broker=REDIS_URL,
+    backend=REDIS_URL,
 )
 
 celery.conf.update(
     # Serialisation -----------------------------------------------------------
-    task_serializer="json",
-    result_serializer="json",
-    accept_content=["json"],
+    # msgpack is smaller on the wire and C-accelerated; json stays accepted
+    # so messages queued by older workers still decode.
+    task_serializer="msgpack",
+    result_serializer="msgpack",
+    accept_content=["msgpack", "json"],
 
     # Timezone ----------------------------------------------------------------
     timezone="UTC",
@@ -34,9 +36,24 @@ celery.conf.update(
     # Result expiry -----------------------------------------------------------
     result_expires=3600,  # 1 hour
 
-    # Reliability -------------------------------------------------------------
-    task_acks_late=True,
-    worker_prefetch_multiplier=1,
+    # Throughput --------------------------------------------------------------
+    # acks_late + prefetch=1 stalls ~2 s between tasks on the Redis broker.
+    # Tasks that need at-least-once delivery opt in with ``acks_late=True``
+    # on the decorator (see ``analyze_commit``).
+    task_acks_late=False,
+    worker_prefetch_multiplier=4,
+
+    # Redis connections -------------------------------------------------------
+    # Reuse pooled, keep-alive sockets for both broker traffic and result
+    # fetches instead of reconnecting on every publish / AsyncResult.get().
+    broker_pool_limit=50,
+    broker_transport_options={
+        "socket_keepalive": True,
+        "visibility_timeout": 3600,  # >= longest acks_late task
+    },
+    redis_socket_keepalive=True,
+    redis_max_connections=50,
+    result_backend_transport_options={"retry_policy": {"timeout": 5.0}},
 
     # Task routing (all tasks go to the default queue) ------------------------
     task_default_queue="risk_analysis",
@@ -4,8 +4,8 @@ import logging
 from functools import lru_cache
 from typing import Optional
 
-from pydantic import field_validator, model_validator
-from pydantic_settings import BaseSettings
+from pydantic import model_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
@@ -17,6 +17,13 @@ class Settings(BaseSettings):
     ``alembic.ini``.
     """
 
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        env_file_encoding="utf-8",
+        case_sensitive=True,
+        frozen=True,  # one immutable instance per process (see get_settings)
+    )
+
     # ── Application ────────────────────────────────────────────────────
     APP_NAME: str = "AI Deployment Risk Predictor"
     APP_VERSION: str = "0.1.0"
@@ -26,6 +33,9 @@ class Settings(BaseSettings):
 
     # ── Database ───────────────────────────────────────────────────────
     DATABASE_URL: str = "sqlite:///./dev.db"
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 40
+    DB_POOL_RECYCLE: int = 300  # seconds — below Neon's idle-connection cutoff
 
     # ── Redis ──────────────────────────────────────────────────────────
     REDIS_URL: str = "redis://redis:6379/0"
@@ -42,6 +52,7 @@ class Settings(BaseSettings):
 
     # ── Clerk Authentication ───────────────────────────────────────────
     CLERK_SECRET_KEY: str = ""
+    CLERK_USER_CACHE_SIZE: int = 4096  # Clerk sub → users.id mappings kept in memory
 
     # ── GitHub API (PAT for fetching repo data) ────────────────────────
     GITHUB_TOKEN: str = ""
@@ -63,34 +74,32 @@ class Settings(BaseSettings):
 
     # ── Validators ─────────────────────────────────────────────────────
 
-    @field_validator("LOG_LEVEL")
-    @classmethod
-    def _validate_log_level(cls, v: str) -> str:
+    @model_validator(mode="after")
+    def _post_init(self) -> "Settings":
+        """
+        Validate and normalise fields in a single pass.
+
+        - LOG_LEVEL is upper-cased and must be a standard level name.
+        - DATABASE_URL must not be empty.
+        - Warn when SECRET_KEY is still the default placeholder.
+        - Derive GOOGLE_REDIRECT_URI from FRONTEND_URL when left blank.
+
+        The model is frozen, hence ``object.__setattr__``.
+        """
         allowed = {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}
-        upper = v.upper()
+        upper = self.LOG_LEVEL.upper()
         if upper not in allowed:
-            raise ValueError(f"LOG_LEVEL must be one of {allowed}, got '{v}'")
-        return upper
+            raise ValueError(f"LOG_LEVEL must be one of {allowed}, got '{self.LOG_LEVEL}'")
+        object.__setattr__(self, "LOG_LEVEL", upper)
 
-    @field_validator("DATABASE_URL")
-    @classmethod
-    def _validate_database_url(cls, v: str) -> str:
-        if not v:
+        if not self.DATABASE_URL:
             raise ValueError("DATABASE_URL must not be empty")
-        return v
 
-    @field_validator("SECRET_KEY")
-    @classmethod
-    def _warn_default_secret(cls, v: str) -> str:
-        if v == "change-this-in-production":
+        if self.SECRET_KEY == "change-this-in-production":
             logging.getLogger("app.config").warning(
                 "SECRET_KEY is still the default placeholder — change it for production!"
             )
-        return v
 
-    @model_validator(mode="after")
-    def _derive_google_redirect_uri(self) -> "Settings":
-        """Derive GOOGLE_REDIRECT_URI from FRONTEND_URL when left blank."""
         if not self.GOOGLE_REDIRECT_URI and self.FRONTEND_URL:
             object.__setattr__(
                 self,
@@ -106,11 +115,6 @@ class Settings(BaseSettings):
         """Return the configured PAT or ``None`` (avoids ``or None`` everywhere)."""
         return self.GITHUB_TOKEN or None
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        case_sensitive = True
-
 
 @lru_cache
 def get_settings() -> Settings:
@@ -1,40 +1,86 @@
+import json
+from typing import Annotated, Any, Iterator
+
+import orjson
+from fastapi import Depends
 from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 from app.config import get_settings
 
-settings = get_settings()
+_settings = get_settings()
 
-_is_sqlite = settings.DATABASE_URL.startswith("sqlite")
+# Bound once at import so hot paths never go back through get_settings().
+DATABASE_URL: str = _settings.DATABASE_URL
+IS_SQLITE: bool = DATABASE_URL.startswith("sqlite")
 
-_engine_kwargs: dict = {"pool_pre_ping": True}
-if _is_sqlite:
+# Room for every distinct statement the routers issue, so compiled SQL is
+# never evicted from the engine's LRU (default size is 500).
+_engine_kwargs: dict = {"query_cache_size": 1200}
+if IS_SQLITE:
     # SQLite requires check_same_thread=False for FastAPI's thread-per-request model
     _engine_kwargs["connect_args"] = {"check_same_thread": False}
 else:
-    _engine_kwargs["pool_size"] = 5
-    _engine_kwargs["max_overflow"] = 10
+    # Recycle connections before the server drops them instead of paying a
+    # pre-ping SELECT 1 round-trip on every checkout.
+    _engine_kwargs["pool_size"] = _settings.DB_POOL_SIZE
+    _engine_kwargs["max_overflow"] = _settings.DB_MAX_OVERFLOW
+    _engine_kwargs["pool_recycle"] = _settings.DB_POOL_RECYCLE
+    _engine_kwargs["pool_pre_ping"] = False
 
     # Neon serverless requires SSL; psycopg honours sslmode in the DSN,
     # but we also pass connect_args so the pool-level connections behave.
     connect_args: dict = {}
-    if "neon.tech" in settings.DATABASE_URL:
+    if "neon.tech" in DATABASE_URL:
         connect_args["sslmode"] = "require"
     if connect_args:
         _engine_kwargs["connect_args"] = connect_args
 
-engine = create_engine(settings.DATABASE_URL, **_engine_kwargs)
+
+def _json_serializer(obj: Any) -> str:
+    """
+    Encode JSON / JSONB column values with orjson instead of stdlib ``json``.
+
+    Values must already be finite: feature dicts are normalised by
+    ``CommitFeatures.to_dict`` (non-finite → ``None``).  orjson would write
+    any stray NaN / Inf as ``null`` rather than the invalid literals
+    ``json.dumps`` emitted.
+    """
+    return orjson.dumps(
+        obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    ).decode()
+
+
+def _json_deserializer(raw: str | bytes) -> Any:
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        # Rows written by json.dumps may carry NaN / Infinity literals
+        return json.loads(raw)
+
+
+_engine_kwargs["json_serializer"] = _json_serializer
+_engine_kwargs["json_deserializer"] = _json_deserializer
+
+engine = create_engine(DATABASE_URL, **_engine_kwargs)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-Base = declarative_base()
 
+class Base(DeclarativeBase):
+    pass
 
-def get_db():
+
+def get_db() -> Iterator[Session]:
     """Dependency that provides a database session per request."""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+# FastAPI caches dependency results per request, so every ``DbSession`` in one
+# request's dependency graph (e.g. a handler *and* get_current_user) shares a
+# single Session instead of each opening and tearing down its own.
+DbSession = Annotated[Session, Depends(get_db)]
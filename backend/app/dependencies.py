@@ -13,16 +13,24 @@ Usage in a router:
 from __future__ import annotations
 
 import logging
-from fastapi import Depends, HTTPException, status
+import threading
+from collections import OrderedDict
+from typing import Annotated
+
+import httpx
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.config import get_settings
+from app.database import DbSession
 from app.models import User
-from app.services.auth import verify_clerk_token
+from app.services.auth import verify_clerk_token_cached
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 
 # The token URL is informational only — clients send: Authorization: Bearer <jwt>
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/github/login", auto_error=False)
@@ -33,6 +41,75 @@ _UNAUTHORIZED = HTTPException(
     headers={"WWW-Authenticate": "Bearer"},
 )
 
+# Built once at import; only the bound ``sub`` changes per call.
+_USER_BY_CLERK_SUB = select(User).where(User.clerk_user_id == bindparam("sub"))
+
+# Clerk ``sub`` → users.id, least-recently-used first.  Only the integer ID
+# is cached (never the ORM object), so the row itself is always loaded
+# through the request's own session.  Unknown subs are never cached, and
+# entries are set / dropped one at a time.
+_clerk_user_ids: OrderedDict[str, int] = OrderedDict()
+_clerk_user_ids_lock = threading.Lock()
+
+
+def _cached_user_pk(clerk_user_id: str) -> int | None:
+    with _clerk_user_ids_lock:
+        user_id = _clerk_user_ids.get(clerk_user_id)
+        if user_id is not None:
+            _clerk_user_ids.move_to_end(clerk_user_id)
+        return user_id
+
+
+def _remember_user_pk(clerk_user_id: str, user_id: int) -> None:
+    with _clerk_user_ids_lock:
+        _clerk_user_ids[clerk_user_id] = user_id
+        _clerk_user_ids.move_to_end(clerk_user_id)
+        if len(_clerk_user_ids) > settings.CLERK_USER_CACHE_SIZE:
+            _clerk_user_ids.popitem(last=False)
+
+
+def _forget_user_pk(clerk_user_id: str) -> None:
+    with _clerk_user_ids_lock:
+        _clerk_user_ids.pop(clerk_user_id, None)
+
+
+def _resolve_clerk_user(clerk_user_id: str, payload: dict, db: Session) -> User:
+    """Return the User for a Clerk ``sub``, provisioning it on first sign-in."""
+    user_id = _cached_user_pk(clerk_user_id)
+    if user_id is not None:
+        user = db.get(User, user_id)
+        # The cached ID may be stale: the row was deleted, and on SQLite its
+        # rowid can since have been reused by a different user.
+        if user is not None and user.clerk_user_id == clerk_user_id:
+            return user
+        _forget_user_pk(clerk_user_id)
+
+    user = db.scalars(_USER_BY_CLERK_SUB, {"sub": clerk_user_id}).one_or_none()
+    if user is None:
+        user = _provision_user(clerk_user_id, payload, db)
+    _remember_user_pk(clerk_user_id, user.id)
+    return user
+
+
+def _unique_username(username_base: str, db: Session) -> str:
+    """
+    Return *username_base*, or the first free ``{base}{n}`` variant.
+
+    All candidates sharing the prefix are fetched in one query and the
+    suffix is picked in Python, instead of probing one name per round-trip.
+    """
+    taken = set(
+        db.scalars(
+            select(User.username).where(User.username.startswith(username_base, autoescape=True))
+        )
+    )
+    username = username_base
+    suffix = 1
+    while username in taken:
+        username = f"{username_base}{suffix}"
+        suffix += 1
+    return username
+
 
 def _provision_user(clerk_user_id: str, payload: dict, db: Session) -> User:
     """
@@ -48,12 +125,7 @@ def _provision_user(clerk_user_id: str, payload: dict, db: Session) -> User:
         if email
         else name.replace(" ", "").lower() or clerk_user_id
     )
-    # Ensure uniqueness
-    username = username_base
-    suffix = 1
-    while db.query(User).filter(User.username == username).first():
-        username = f"{username_base}{suffix}"
-        suffix += 1
+    username = _unique_username(username_base, db)
 
     user = User(
         clerk_user_id=clerk_user_id,
@@ -69,8 +141,8 @@ def _provision_user(clerk_user_id: str, payload: dict, db: Session) -> User:
 
 
 def get_current_user(
+    db: DbSession,
     token: str | None = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
 ) -> User:
     """
     Resolve a Clerk JWT bearer token to a User ORM object.
@@ -84,7 +156,7 @@ def get_current_user(
         raise _UNAUTHORIZED
 
     try:
-        payload = verify_clerk_token(token)
+        payload = verify_clerk_token_cached(token)
         clerk_user_id: str | None = payload.get("sub")
         if not clerk_user_id:
             raise ValueError("JWT missing 'sub' claim")
@@ -93,9 +165,7 @@ def get_current_user(
         raise _UNAUTHORIZED
 
     try:
-        user = db.query(User).filter(User.clerk_user_id == clerk_user_id).first()
-        if user is None:
-            user = _provision_user(clerk_user_id, payload, db)
+        user = _resolve_clerk_user(clerk_user_id, payload, db)
     except Exception as exc:
         logger.error("User provisioning failed: %s", exc)
         raise HTTPException(status_code=500, detail=f"User provisioning error: {exc}")
@@ -107,20 +177,26 @@ def get_current_user(
 
 
 def get_optional_user(
+    db: DbSession,
     token: str | None = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
 ) -> User | None:
     """Like get_current_user but returns None instead of raising 401."""
     if token is None:
         return None
     try:
-        payload = verify_clerk_token(token)
+        payload = verify_clerk_token_cached(token)
         clerk_user_id = payload.get("sub")
         if not clerk_user_id:
             return None
-        user = db.query(User).filter(User.clerk_user_id == clerk_user_id).first()
-        if user is None:
-            user = _provision_user(clerk_user_id, payload, db)
+        user = _resolve_clerk_user(clerk_user_id, payload, db)
         return user if user.is_active else None
     except Exception:
         return None
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """The process-wide pooled ``httpx.AsyncClient`` opened in ``lifespan``."""
+    return request.app.state.http
+
+
+HttpClient = Annotated[httpx.AsyncClient, Depends(get_http_client)]
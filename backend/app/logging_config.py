@@ -25,6 +25,14 @@ def setup_logging(level: str = "INFO") -> None:
     """
     numeric_level = getattr(logging, level.upper(), logging.INFO)
 
+    # The format below never prints caller, thread or process info, so skip
+    # collecting it for every LogRecord (see "Optimization" in the logging
+    # HOWTO) — findCaller()'s stack walk is the priciest part of a record.
+    logging._srcfile = None
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     formatter = logging.Formatter(
         fmt="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
@@ -2,14 +2,15 @@ import logging
 import time
 from contextlib import asynccontextmanager
 
+import httpx
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 
 from app.config import get_settings
 from app.database import Base, engine
 from app.exceptions import AppError
 from app.logging_config import setup_logging
+from app.responses import ORJSONResponse
 from app.routers import auth, dashboard, health, predictions, repositories, webhooks
 
 settings = get_settings()
@@ -19,7 +20,8 @@ setup_logging(level=settings.LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
 # Recorded at import time so the /health endpoint can report uptime.
-APP_START_TIME: float = time.time()
+# Monotonic, so NTP / wall-clock adjustments never skew the reported value.
+APP_START_TIME: float = time.monotonic()
 
 
 @asynccontextmanager
@@ -46,8 +48,17 @@ async def lifespan(app: FastAPI):
     except Exception as exc:  # noqa: BLE001
         logger.warning("Could not initialise ML predictor: %s", exc)
 
+    # One keep-alive pool for outbound OAuth / API calls, so repeat requests
+    # to github.com / googleapis.com skip the TCP + TLS handshake.
+    app.state.http = httpx.AsyncClient(
+        timeout=15,
+        limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+    )
+
     yield
 
+    await app.state.http.aclose()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -64,20 +75,20 @@ app = FastAPI(
 # ---------------------------------------------------------------------------
 
 @app.exception_handler(AppError)
-async def app_error_handler(_request: Request, exc: AppError) -> JSONResponse:
+async def app_error_handler(_request: Request, exc: AppError) -> ORJSONResponse:
     """Translate any ``AppError`` subclass into a JSON response."""
     logger.warning("AppError [%s]: %s", exc.status_code, exc.detail)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail},
     )
 
 
 @app.exception_handler(Exception)
-async def unhandled_exception_handler(_request: Request, exc: Exception) -> JSONResponse:
+async def unhandled_exception_handler(_request: Request, exc: Exception) -> ORJSONResponse:
     """Catch-all for unexpected errors — log the traceback, return 500."""
     logger.exception("Unhandled exception: %s", exc)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "An unexpected error occurred. Please try again later."},
     )
@@ -100,11 +111,16 @@ app.add_middleware(
 # Request logging middleware
 # ---------------------------------------------------------------------------
 
-@app.middleware("http")
+# Evaluated once after setup_logging(); when DEBUG is off the middleware is
+# never installed, so requests skip the extra ASGI hop, clock reads and
+# log-record construction entirely.
+_DEBUG_ENABLED: bool = logger.isEnabledFor(logging.DEBUG)
+
+
 async def log_requests(request: Request, call_next):
-    start = time.time()
+    start = time.monotonic_ns()
     response = await call_next(request)
-    duration_ms = round((time.time() - start) * 1000, 2)
+    duration_ms = (time.monotonic_ns() - start) / 1e6
     logger.debug(
         "%s %s → %s (%.2f ms)",
         request.method,
@@ -115,6 +131,10 @@ async def log_requests(request: Request, call_next):
     return response
 
 
+if _DEBUG_ENABLED:
+    app.middleware("http")(log_requests)
+
+
 # ---------------------------------------------------------------------------
 # Routers
 # ---------------------------------------------------------------------------
@@ -18,6 +18,9 @@ Examples:
     # Train gradient boosting + export CSV
     python -m app.ml.trainer --model gb --synthetic --csv-export data.csv
 
+    # Train all models in parallel; the best ROC AUC becomes latest.pkl
+    python -m app.ml.trainer --model all --synthetic
+
     # Train with 1000 synthetic samples
     python -m app.ml.trainer --synthetic --synthetic-count 1000
 """
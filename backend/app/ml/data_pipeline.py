@@ -19,21 +19,31 @@ from __future__ import annotations
 import json
 import logging
 import os
+import sys
+import warnings
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 from sqlalchemy.orm import Session
 
-from app.models import Commit, Repository, RiskAssessment
+from app.models import Commit, Repository, RiskAssessment, RiskLevel
 from app.services.risk_engine import CommitFeatures, extract_features
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    _fast_json_loads = orjson.loads
+except ImportError:
+    _fast_json_loads = json.loads
+
 # Feature columns used by the ML model (must be numeric).
-# This is the ordered list fed into the model — keep in sync with
-# CommitFeatures fields.
-FEATURE_COLUMNS: list[str] = [
+# This is the ordered sequence fed into the model — keep in sync with
+# CommitFeatures fields.  An immutable tuple of interned names so the
+# per-row dict lookups hash-compare by identity.
+FEATURE_COLUMNS: tuple[str, ...] = tuple(sys.intern(c) for c in [
     # Code-level
     "lines_added",
     "lines_deleted",
@@ -70,58 +80,149 @@ FEATURE_COLUMNS: list[str] = [
     "message_length",
     "has_risky_keywords",  # will be cast to int (0/1)
     "risky_keyword_count",
-]
+])
+
+# Element type of the feature matrix end-to-end (training and inference).
+# The features are counts, ratios and small floats that fit comfortably in
+# float32, which halves the memory traffic of every per-column pass.
+FEATURE_DTYPE = "float32"
+
+# Boolean features, stored as 0/1 in the feature matrix.
+_BOOL_COLUMNS: frozenset[str] = frozenset({"weekend_flag", "has_risky_keywords"})
 
 
 # ---------------------------------------------------------------------------
 # Step 1 — Collect raw data from DB
 # ---------------------------------------------------------------------------
 
-def collect_training_samples(db: Session) -> list[dict]:
+def _parse_features_json(raw):
+    """Parse a stored ``features_json`` payload (dict, str or bytes)."""
+    if isinstance(raw, dict):
+        return raw
+    try:
+        return _fast_json_loads(raw)
+    except ValueError:
+        # orjson rejects the NaN / Infinity literals json.dumps can emit
+        return json.loads(raw)
+
+
+@dataclass
+class SampleBatch:
+    """
+    Column-oriented (struct-of-arrays) set of training samples.
+
+    ``feature_rows`` is a Fortran-ordered matrix with columns in
+    ``FEATURE_COLUMNS`` order, ready for :func:`preprocess`.  It is
+    ``FEATURE_DTYPE`` unless built with ``dtype="float64"`` to keep large
+    counts exact for :func:`export_to_csv`.
+    """
+
+    feature_rows: Any
+    labels: Any
+    shas: list[str] = field(default_factory=list)
+    repository_full_names: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    @classmethod
+    def from_samples(
+        cls, samples: list[dict], dtype: str = FEATURE_DTYPE,
+    ) -> "SampleBatch":
+        """Build a batch from legacy ``list[dict]`` samples."""
+        np = _try_import_numpy()
+        return cls(
+            feature_rows=_features_to_matrix(
+                [s["features"] for s in samples], dtype
+            ),
+            labels=np.fromiter(
+                (int(s.get("label", 0)) for s in samples),
+                dtype=np.int32,
+                count=len(samples),
+            ),
+            shas=[s.get("sha", "") for s in samples],
+            repository_full_names=[
+                s.get("repository_full_name", "") for s in samples
+            ],
+        )
+
+    def concat(self, other: "SampleBatch") -> "SampleBatch":
+        """Return a new batch with *other*'s samples appended."""
+        if not len(self):
+            return other
+        if not len(other):
+            return self
+        np = _try_import_numpy()
+        return SampleBatch(
+            feature_rows=np.asfortranarray(
+                np.concatenate([self.feature_rows, other.feature_rows])
+            ),
+            labels=np.concatenate([self.labels, other.labels]),
+            shas=self.shas + other.shas,
+            repository_full_names=(
+                self.repository_full_names + other.repository_full_names
+            ),
+        )
+
+
+def collect_training_samples(
+    db: Session, dtype: str = FEATURE_DTYPE,
+) -> SampleBatch:
     """
     Query every commit that has a stored ``features_json`` and
-    ``risk_assessment`` and return a list of dicts ready for feature matrix
-    construction.
+    ``risk_assessment`` and return them as a :class:`SampleBatch` ready
+    for preprocessing.
 
-    Each dict contains:
-        - ``features``: parsed CommitFeatures dict
-        - ``label``: 1 if the rule-based engine flagged HIGH, else 0
+    Per sample:
+        - feature row: parsed CommitFeatures dict in ``FEATURE_COLUMNS`` order
+        - label: 1 if the rule-based engine flagged HIGH, else 0
           (bootstrap labeling; will be replaced by ``labeling.py`` once
           GitHub API labels are collected)
-        - ``sha``, ``repository_full_name``
+        - sha, repository full name
+
+    Pass ``dtype="float64"`` when the batch is headed for
+    :func:`export_to_csv`; ``FEATURE_DTYPE`` rounds counts above 2**24.
     """
-    samples: list[dict] = []
+    np = _try_import_numpy()
 
-    assessments = (
-        db.query(RiskAssessment)
-        .join(Commit)
+    feature_dicts: list[dict] = []
+    labels: list[int] = []
+    shas: list[str] = []
+    repo_names: list[str] = []
+
+    # Plain column tuples, streamed in batches — no ORM object hydration
+    rows = (
+        db.query(
+            RiskAssessment.features_json,
+            RiskAssessment.risk_level,
+            Commit.sha,
+            Repository.full_name,
+        )
+        .join(Commit, RiskAssessment.commit_id == Commit.id)
+        .outerjoin(Repository, Commit.repository_id == Repository.id)
         .filter(RiskAssessment.features_json.isnot(None))
-        .all()
+        .yield_per(5000)
     )
 
-    for a in assessments:
+    for features_json, risk_level, sha, full_name in rows:
         try:
-            features_dict = json.loads(a.features_json)
-        except (json.JSONDecodeError, TypeError):
+            features_dict = _parse_features_json(features_json)
+        except (ValueError, TypeError):
             continue
 
-        commit = a.commit
-        if not commit:
-            continue
-
-        repo = commit.repository
-        full_name = repo.full_name if repo else "unknown"
+        feature_dicts.append(features_dict)
+        labels.append(1 if risk_level == RiskLevel.HIGH else 0)
+        shas.append(sha)
+        repo_names.append(full_name or "unknown")
 
-        samples.append({
-            "sha": commit.sha,
-            "repository_full_name": full_name,
-            "features": features_dict,
-            "label": a.label if hasattr(a, "label") and a.label is not None
-                     else (1 if a.risk_level and a.risk_level.value == "HIGH" else 0),
-        })
-
-    logger.info("Collected %d training samples from database.", len(samples))
-    return samples
+    batch = SampleBatch(
+        feature_rows=_features_to_matrix(feature_dicts, dtype),
+        labels=np.asarray(labels, dtype=np.int32),
+        shas=shas,
+        repository_full_names=repo_names,
+    )
+    logger.info("Collected %d training samples from database.", len(batch))
+    return batch
 
 
 # ---------------------------------------------------------------------------
@@ -139,41 +240,56 @@ def _try_import_numpy():
         )
 
 
+def _try_import_pandas():
+    try:
+        import pandas as pd
+        return pd
+    except ImportError:
+        raise ImportError(
+            "pandas is required for ML training. "
+            "Install with:  pip install -r requirements-ml.txt"
+        )
+
+
+def _features_to_matrix(feature_dicts: list[dict], dtype: str = FEATURE_DTYPE):
+    """
+    Convert feature dicts to a Fortran-ordered *dtype* matrix.
+
+    Missing keys, ``None`` (how ``CommitFeatures.to_dict`` stores NaN /
+    Inf) and ``NaN`` all become ``NaN``, which :func:`preprocess` imputes
+    with the column median, exactly as inference does
+    (``predictor._predict_ml``).  Booleans become 0/1.
+    """
+    np = _try_import_numpy()
+    pd = _try_import_pandas()
+
+    # pandas parses the records column-wise in C (absent keys and None →
+    # NaN) and its block is already column-major, so asfortranarray() is
+    # normally a no-op.  copy=True: under copy-on-write to_numpy() may hand
+    # back a read-only view, and preprocess() imputes in place.
+    frame = pd.DataFrame(feature_dicts, columns=FEATURE_COLUMNS)
+    return np.asfortranarray(frame.to_numpy(dtype=dtype, copy=True))
+
+
 def build_feature_matrix(
-    samples: list[dict],
+    samples: SampleBatch | list[dict],
 ) -> tuple:
     """
-    Convert a list of sample dicts into a NumPy feature matrix ``X`` and
-    label vector ``y``.
+    Convert samples into a NumPy feature matrix ``X`` and label vector ``y``.
+
+    Accepts a :class:`SampleBatch` or a legacy list of sample dicts.  ``X``
+    is always ``FEATURE_DTYPE``; a float64 batch is narrowed here.
 
     Returns:
         ``(X, y, shas)``  where ``X.shape = (n_samples, n_features)`` and
         ``y.shape = (n_samples,)``.  ``shas`` is a list of commit SHAs for
         traceability.
     """
+    if not isinstance(samples, SampleBatch):
+        samples = SampleBatch.from_samples(samples)
     np = _try_import_numpy()
-
-    rows: list[list[float]] = []
-    labels: list[int] = []
-    shas: list[str] = []
-
-    for sample in samples:
-        fd = sample["features"]
-        row = []
-        for col in FEATURE_COLUMNS:
-            val = fd.get(col, 0)
-            # Cast booleans to int
-            if isinstance(val, bool):
-                val = int(val)
-            elif val is None:
-                val = 0.0
-            row.append(float(val))
-        rows.append(row)
-        labels.append(int(sample.get("label", 0)))
-        shas.append(sample.get("sha", ""))
-
-    X = np.array(rows, dtype=np.float64)
-    y = np.array(labels, dtype=np.int32)
+    X = np.asarray(samples.feature_rows, dtype=FEATURE_DTYPE)
+    y, shas = samples.labels, samples.shas
 
     logger.info(
         "Feature matrix built: X=%s  y=%s  positive_rate=%.2f%%",
@@ -187,6 +303,45 @@ def build_feature_matrix(
 # Step 3 — Preprocess  (AI_Model_Engineering.md §7)
 # ---------------------------------------------------------------------------
 
+# Rows per chunk when imputing / scaling, bounding temporary allocations.
+_PREPROCESS_CHUNK_ROWS = 10_000
+
+
+def _row_chunks(n_rows: int) -> list[slice]:
+    """Row slices of at most ``_PREPROCESS_CHUNK_ROWS`` covering ``n_rows``."""
+    return [
+        slice(start, start + _PREPROCESS_CHUNK_ROWS)
+        for start in range(0, n_rows, _PREPROCESS_CHUNK_ROWS)
+    ]
+
+
+class MedianImputer:
+    """
+    Median imputation without sklearn's validation / copying overhead.
+
+    ``fit`` takes per-column ``np.nanmedian``; ``transform`` fills NaNs in
+    place.  Exposes ``statistics_`` / ``n_features_in_`` like sklearn's
+    ``SimpleImputer`` so saved bundles work with either.  Columns with no
+    observed values impute to 0 instead of being dropped, keeping the
+    width in line with ``FEATURE_COLUMNS``.
+    """
+
+    def fit(self, X):
+        np = _try_import_numpy()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN column
+            medians = np.nanmedian(X, axis=0)
+        self.statistics_ = np.nan_to_num(medians, nan=0.0).astype(X.dtype)
+        self.n_features_in_ = X.shape[1]
+        return self
+
+    def transform(self, X):
+        """Replace NaNs in the float array ``X`` in place and return it."""
+        np = _try_import_numpy()
+        np.copyto(X, self.statistics_, where=np.isnan(X))
+        return X
+
+
 def preprocess(
     X,
     y,
@@ -206,43 +361,69 @@ def preprocess(
         fit:      If ``True``, fit scaler + imputer on this data.
                   If ``False``, transform only (use existing fitted objects).
         scaler:   Pre-fitted ``StandardScaler`` (required when ``fit=False``).
-        imputer:  Pre-fitted ``SimpleImputer`` (required when ``fit=False``).
+        imputer:  Pre-fitted ``MedianImputer`` or sklearn ``SimpleImputer``
+                  (required when ``fit=False``).
 
     Returns:
         ``(X_clean, y_clean, scaler, imputer)``
+
+    Note: a float32 Fortran-ordered ``X`` (as returned by
+    ``build_feature_matrix``) is cleaned and transformed in place.
     """
     np = _try_import_numpy()
-    from sklearn.impute import SimpleImputer
+    # Imported here, not at module level: predictor.py imports this module
+    # for FEATURE_COLUMNS, and the rule-based path must not pay for sklearn.
     from sklearn.preprocessing import StandardScaler
 
-    # Replace infinities with NaN so imputer can handle them
-    X = np.where(np.isinf(X), np.nan, X)
+    # Replace infinities with NaN so imputer can handle them.  Done in place
+    # (no copy when X is already a float32 F-ordered array, as produced by
+    # build_feature_matrix) to avoid a second X-sized allocation.
+    X = np.asfortranarray(X, dtype=FEATURE_DTYPE)
 
     # --- Remove corrupted samples (all-zero or all-NaN rows) ---
-    valid_mask = ~np.all(np.isnan(X) | (X == 0), axis=1)
+    # A row is kept if it has at least one finite non-zero value.  Both
+    # passes run per row chunk, so the boolean temporaries stay
+    # O(chunk × n_features) however many samples there are.
+    valid_mask = np.empty(len(X), dtype=bool)
+    for sl in _row_chunks(len(X)):
+        block = X[sl]
+        np.copyto(block, np.nan, where=np.isinf(block))
+        nonzero = block != 0
+        np.logical_and(nonzero, np.isfinite(block), out=nonzero)
+        nonzero.any(axis=1, out=valid_mask[sl])
     if not np.all(valid_mask):
         removed = int((~valid_mask).sum())
         logger.info("Removing %d corrupted samples.", removed)
         X = X[valid_mask]
         y = y[valid_mask]
 
-    # --- Median imputation ---
+    # --- Median imputation  +  StandardScaler ---
     if fit:
-        imputer = SimpleImputer(strategy="median")
-        X = imputer.fit_transform(X)
+        imputer = MedianImputer().fit(X)
+        scaler = StandardScaler(copy=False)
     else:
         if imputer is None:
             raise ValueError("imputer must be provided when fit=False")
-        X = imputer.transform(X)
-
-    # --- StandardScaler ---
-    if fit:
-        scaler = StandardScaler()
-        X = scaler.fit_transform(X)
-    else:
         if scaler is None:
             raise ValueError("scaler must be provided when fit=False")
-        X = scaler.transform(X)
+
+    if np.isnan(imputer.statistics_).any():
+        # A legacy SimpleImputer drops all-NaN columns, so its output can't
+        # be written back into X — transform the whole matrix instead.
+        X = imputer.transform(X)
+        X = scaler.fit_transform(X) if fit else scaler.transform(X)
+    else:
+        # Transform in row chunks written back into X, so temporaries stay
+        # O(chunk × n_features); the scaler's mean / variance are
+        # accumulated incrementally (Welford) via partial_fit.
+        chunks = _row_chunks(len(X))
+        for sl in chunks:
+            X[sl] = imputer.transform(X[sl])
+        if fit:
+            for sl in chunks:
+                scaler.partial_fit(X[sl])
+        for sl in chunks:
+            X[sl] = scaler.transform(X[sl])
 
     logger.info("Preprocessing complete. X=%s", X.shape)
     return X, y, scaler, imputer
@@ -277,34 +458,37 @@ def split_data(X, y, test_size: float = 0.2, random_state: int = 42):
 # ---------------------------------------------------------------------------
 
 def export_to_csv(
-    samples: list[dict],
+    samples: SampleBatch | list[dict],
     output_path: str | Path = "training_data.csv",
 ) -> Path:
     """
     Save the training samples as a CSV file for manual inspection or
     external training in a Jupyter notebook.
+
+    Missing feature values are written as empty cells.  A
+    ``FEATURE_DTYPE`` batch exports counts above 2**24 rounded; collect with
+    ``dtype="float64"`` to keep them exact.
     """
-    import csv
+    pd = _try_import_pandas()
 
     output_path = Path(output_path)
-    header = ["sha", "repository", "label"] + FEATURE_COLUMNS
-
-    with open(output_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(header)
-        for sample in samples:
-            fd = sample["features"]
-            row = [
-                sample["sha"],
-                sample.get("repository_full_name", ""),
-                sample.get("label", 0),
-            ]
-            for col in FEATURE_COLUMNS:
-                val = fd.get(col, 0)
-                if isinstance(val, bool):
-                    val = int(val)
-                row.append(val)
-            writer.writerow(row)
+    if not isinstance(samples, SampleBatch):
+        samples = SampleBatch.from_samples(samples, dtype="float64")
+
+    df = pd.DataFrame(samples.feature_rows, columns=FEATURE_COLUMNS)
+    # Counts and flags were stored as floats in the matrix — write them back
+    # as integers when every present value is integral; the nullable Int64
+    # keeps missing values as empty cells.
+    for col in df.columns:
+        values = df[col]
+        present = values.dropna()
+        if present.size and (present % 1 == 0).all():
+            df[col] = values.astype("Int64")
+    df.insert(0, "sha", samples.shas)
+    df.insert(1, "repository", samples.repository_full_names)
+    df.insert(2, "label", samples.labels)
+
+    df.to_csv(output_path, index=False, encoding="utf-8")
 
     logger.info("Exported %d samples to %s", len(samples), output_path)
     return output_path
@@ -17,18 +17,26 @@ Production inference flow (§11):
 from __future__ import annotations
 
 import logging
+import sys
+import threading
 from pathlib import Path
 from typing import Optional
 
 import numpy as np
 
-from app.ml.data_pipeline import FEATURE_COLUMNS
+# Neither module imports sklearn at import time; it is pulled in by
+# unpickling inside load(), so the rule-based fallback never loads it.
+from app.ml.data_pipeline import FEATURE_COLUMNS, FEATURE_DTYPE
 from app.ml.trainer import MODELS_DIR, load_model
 from app.models import RiskLevel
 from app.services.risk_engine import CommitFeatures, RiskResult, calculate_risk
 
 logger = logging.getLogger(__name__)
 
+# Below this many rows a RandomForest is evaluated tree-by-tree in-process;
+# joblib's parallel dispatch costs more than the trees themselves.
+_RF_DIRECT_MAX_ROWS = 32
+
 
 # ---------------------------------------------------------------------------
 # Singleton model holder — loaded once at import / startup
@@ -46,7 +54,18 @@ class ModelPredictor:
         self._model = None
         self._scaler = None
         self._imputer = None
-        self._feature_columns: list[str] = FEATURE_COLUMNS
+        # Plain-array copies of the fitted imputer / scaler parameters,
+        # used by _predict_ml to skip sklearn's per-call validation.
+        self._medians: Optional[np.ndarray] = None
+        self._mean: Optional[np.ndarray] = None
+        self._scale: Optional[np.ndarray] = None
+        self._fast_preprocess: bool = False
+        # Fitted trees of a RandomForest model, for small-batch inference
+        self._rf_estimators: Optional[list] = None
+        # Per-thread (1, n_features) input buffer — sync endpoints call
+        # predict() concurrently from the threadpool.
+        self._local = threading.local()
+        self._feature_columns: tuple[str, ...] = FEATURE_COLUMNS
         self._version: str = "rule-v1"
         self._model_name: str = "rule_based"
         self._available: bool = False
@@ -81,7 +100,11 @@ class ModelPredictor:
             self._model = bundle["model"]
             self._scaler = bundle.get("scaler")
             self._imputer = bundle.get("imputer")
-            self._feature_columns = bundle.get("feature_columns", FEATURE_COLUMNS)
+            self._extract_preprocessing_params()
+            self._rf_estimators = self._random_forest_estimators(self._model)
+            self._feature_columns = tuple(
+                sys.intern(c) for c in bundle.get("feature_columns", FEATURE_COLUMNS)
+            )
             self._version = bundle.get("version", "ml-v1")
             self._model_name = bundle.get("model_name", "unknown")
             self._available = True
@@ -106,6 +129,56 @@ class ModelPredictor:
             self._available = False
             return False
 
+    def _extract_preprocessing_params(self) -> None:
+        """
+        Pull the fitted imputer statistics and scaler mean / scale out as
+        ``FEATURE_DTYPE`` arrays so single-row inference is three vector ops
+        instead of two ``transform`` calls.
+
+        Falls back to the sklearn objects when the parameters cannot be
+        applied as-is (e.g. the imputer dropped an all-NaN column).
+        """
+        self._medians = self._mean = self._scale = None
+        self._fast_preprocess = False
+        try:
+            if self._imputer is not None:
+                medians = np.asarray(self._imputer.statistics_, dtype=FEATURE_DTYPE)
+                if np.isnan(medians).any():
+                    return
+                self._medians = medians
+            if self._scaler is not None:
+                n = self._scaler.n_features_in_
+                self._mean = (
+                    np.asarray(self._scaler.mean_, dtype=FEATURE_DTYPE)
+                    if self._scaler.with_mean else np.zeros(n, dtype=FEATURE_DTYPE)
+                )
+                self._scale = (
+                    np.asarray(self._scaler.scale_, dtype=FEATURE_DTYPE)
+                    if self._scaler.with_std else np.ones(n, dtype=FEATURE_DTYPE)
+                )
+        except AttributeError:
+            self._medians = self._mean = self._scale = None
+            return
+        self._fast_preprocess = True
+
+    @staticmethod
+    def _random_forest_estimators(model) -> Optional[list]:
+        """Return ``model.estimators_`` when *model* is a RandomForest."""
+        from sklearn.ensemble import RandomForestClassifier
+
+        if isinstance(model, RandomForestClassifier):
+            return list(model.estimators_)
+        return None
+
+    def _row_buffer(self) -> np.ndarray:
+        """Return this thread's reusable input row, (re)allocated on demand."""
+        n = len(self._feature_columns)
+        buf = getattr(self._local, "row", None)
+        if buf is None or buf.shape[1] != n:
+            buf = np.zeros((1, n), dtype=FEATURE_DTYPE)
+            self._local.row = buf
+        return buf
+
     def predict(self, features: CommitFeatures) -> RiskResult:
         """
         Predict risk for a commit.
@@ -122,37 +195,105 @@ class ModelPredictor:
 
         return self._predict_ml(features)
 
+    def predict_batch(self, features_list: list[CommitFeatures]) -> list[RiskResult]:
+        """
+        Predict risk for many commits at once.
+
+        Rows are stacked into one ``(B, n_features)`` matrix so imputation,
+        scaling and ``predict_proba`` each run once for the whole batch.
+        Falls back to the rule-based engine when no ML model is loaded.
+        """
+        if not self._available:
+            return [calculate_risk(f) for f in features_list]
+        if not features_list:
+            return []
+
+        cols = self._feature_columns
+        X = np.array(
+            [[np.nan if (v := fd.get(col)) is None else v for col in cols]
+             for fd in (f.to_dict() for f in features_list)],
+            dtype=FEATURE_DTYPE,
+        )
+        X = self._preprocess(X)
+        probabilities = self._risk_probabilities(X).tolist()
+
+        results = [
+            self._ml_result(features, p)
+            for features, p in zip(features_list, probabilities)
+        ]
+        logger.info(
+            "ML batch prediction: %d commits  [%s %s]",
+            len(results), self._model_name, self._version,
+        )
+        return results
+
     def _predict_ml(self, features: CommitFeatures) -> RiskResult:
         """Run inference with the ML model."""
         # 1. Build feature vector in the correct column order
         fd = features.to_dict()
-        row = []
-        for col in self._feature_columns:
-            val = fd.get(col, 0)
-            if isinstance(val, bool):
-                val = int(val)
-            elif val is None:
-                val = 0.0
-            row.append(float(val))
-
-        X = np.array([row], dtype=np.float64)
-
-        # 2. Preprocess  (impute + scale) using the fitted objects
-        if self._imputer is not None:
-            X = self._imputer.transform(X)
-        if self._scaler is not None:
-            X = self._scaler.transform(X)
-
-        # 3. Predict probability
+        # Missing / None → NaN, imputed by _preprocess as in training; the
+        # single slice assignment converts the raw ints / floats / bools to
+        # FEATURE_DTYPE in one C loop.
+        X = self._row_buffer()
+        X[0] = [
+            np.nan if (v := fd.get(col)) is None else v
+            for col in self._feature_columns
+        ]
+
+        # 2. Preprocess  (impute + scale)  and  3. predict probability
+        X = self._preprocess(X)
+        risk_probability = float(self._risk_probabilities(X)[0])
+
+        result = self._ml_result(features, risk_probability)
+        logger.info(
+            "ML prediction: score=%.1f (%s) confidence=%.2f  [%s %s]",
+            result.risk_score, result.risk_level.value, result.confidence,
+            self._model_name, self._version,
+        )
+        return result
+
+    def _preprocess(self, X: np.ndarray) -> np.ndarray:
+        """Impute + scale ``X`` using the fitted parameters (in place when possible)."""
+        if self._fast_preprocess:
+            if self._medians is not None:
+                np.copyto(X, self._medians, where=np.isnan(X))
+            else:
+                # Bundles saved without an imputer were trained on missing → 0.
+                np.nan_to_num(X, copy=False, nan=0.0)
+            if self._mean is not None:
+                X -= self._mean
+                X /= self._scale
+        else:
+            if self._imputer is not None:
+                X = self._imputer.transform(X)
+            else:
+                np.nan_to_num(X, copy=False, nan=0.0)
+            if self._scaler is not None:
+                X = self._scaler.transform(X)
+        return X
+
+    def _risk_probabilities(self, X: np.ndarray) -> np.ndarray:
+        """Return P(risky) for every row of ``X``."""
+        if self._rf_estimators is not None and len(X) < _RF_DIRECT_MAX_ROWS:
+            # Same averaging RandomForestClassifier.predict_proba does, minus
+            # the joblib Parallel setup; trees expect C-contiguous float32.
+            X = np.ascontiguousarray(X, dtype=np.float32)
+            proba = sum(
+                tree.predict_proba(X, check_input=False)
+                for tree in self._rf_estimators
+            ) / len(self._rf_estimators)
+            return proba[:, 1] if proba.shape[1] > 1 else proba[:, 0]
+
         try:
-            proba = self._model.predict_proba(X)[0]
-            # proba = [P(safe), P(risky)]
-            risk_probability = float(proba[1]) if len(proba) > 1 else float(proba[0])
+            proba = self._model.predict_proba(X)
+            # proba[:, 0] = P(safe), proba[:, 1] = P(risky)
+            return proba[:, 1] if proba.shape[1] > 1 else proba[:, 0]
         except Exception:
             # Some models may not have predict_proba
-            pred = self._model.predict(X)[0]
-            risk_probability = float(pred)
+            return np.asarray(self._model.predict(X), dtype=np.float64)
 
+    def _ml_result(self, features: CommitFeatures, risk_probability: float) -> RiskResult:
+        """Turn a model probability into a :class:`RiskResult`."""
         # 4. Convert probability to risk score (0–100)
         risk_score = round(risk_probability * 100, 2)
 
@@ -170,11 +311,6 @@ class ModelPredictor:
         # Also run the rule-based engine to get the interpretable breakdown
         rule_result = calculate_risk(features)
 
-        logger.info(
-            "ML prediction: score=%.1f (%s) confidence=%.2f  [%s %s]",
-            risk_score, level.value, confidence, self._model_name, self._version,
-        )
-
         return RiskResult(
             risk_score=risk_score,
             risk_level=level,
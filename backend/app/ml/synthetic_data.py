@@ -13,13 +13,37 @@ The distributions are designed to mimic real-world patterns:
 from __future__ import annotations
 
 import logging
-import random
-from typing import Optional
 
-from app.ml.data_pipeline import FEATURE_COLUMNS
+from app.ml.data_pipeline import (
+    _BOOL_COLUMNS,
+    FEATURE_COLUMNS,
+    FEATURE_DTYPE,
+    SampleBatch,
+    _try_import_numpy,
+)
 
 logger = logging.getLogger(__name__)
 
+# Columns that are emitted as ``int`` (rather than float) in the dict form
+# returned by ``generate_synthetic_samples``; ``_BOOL_COLUMNS`` become bool.
+_INT_COLUMNS = frozenset({
+    "lines_added",
+    "lines_deleted",
+    "total_lines_changed",
+    "files_changed",
+    "file_types_count",
+    "total_cc_blocks",
+    "complexity_python_files",
+    "total_prior_commits",
+    "repo_size",
+    "contributor_count",
+    "open_issues_count",
+    "day_of_week",
+    "hour_of_day",
+    "message_length",
+    "risky_keyword_count",
+})
+
 
 def generate_synthetic_samples(
     count: int = 500,
@@ -36,82 +60,128 @@ def generate_synthetic_samples(
 
     Returns:
         List of sample dicts compatible with ``build_feature_matrix()``.
+        Callers that only need arrays should use
+        ``generate_synthetic_batch()`` / ``generate_synthetic_matrix()``
+        and skip the dict round-trip.
     """
-    rng = random.Random(seed)
-    samples: list[dict] = []
-    n_risky = int(count * positive_rate)
-
-    for i in range(count):
-        is_risky = i < n_risky
-        features = _generate_features(rng, is_risky)
-
-        samples.append({
-            "sha": f"synthetic_{i:06d}",
+    X, y, shas = generate_synthetic_matrix(count, positive_rate, seed)
+
+    columns = []
+    for j, col in enumerate(FEATURE_COLUMNS):
+        values = X[:, j]
+        if col in _BOOL_COLUMNS:
+            columns.append(values.astype(bool).tolist())
+        elif col in _INT_COLUMNS:
+            columns.append(values.astype(int).tolist())
+        else:
+            columns.append(values.tolist())
+
+    return [
+        {
+            "sha": sha,
             "repository_full_name": "synthetic/repo",
-            "features": features,
-            "label": 1 if is_risky else 0,
-        })
+            "features": dict(zip(FEATURE_COLUMNS, row)),
+            "label": label,
+        }
+        for sha, label, row in zip(shas, y.tolist(), zip(*columns))
+    ]
 
-    rng.shuffle(samples)
 
-    logger.info(
-        "Generated %d synthetic samples (%.0f%% risky).",
-        count, positive_rate * 100,
+def generate_synthetic_batch(
+    count: int = 500,
+    positive_rate: float = 0.3,
+    seed: int = 42,
+) -> SampleBatch:
+    """Generate *count* synthetic samples as a :class:`SampleBatch`."""
+    X, y, shas = generate_synthetic_matrix(count, positive_rate, seed)
+    return SampleBatch(
+        feature_rows=X,
+        labels=y,
+        shas=shas,
+        repository_full_names=["synthetic/repo"] * count,
     )
-    return samples
-
-
-def _generate_features(rng: random.Random, is_risky: bool) -> dict:
-    """Generate a single feature dict with realistic distributions."""
-
-    if is_risky:
-        # Risky commits: large, complex, odd hours, inexperienced dev
-        lines_added = rng.randint(100, 1500)
-        lines_deleted = rng.randint(20, 500)
-        files_changed = rng.randint(5, 50)
-        avg_cc = rng.uniform(5, 30)
-        max_cc = avg_cc + rng.uniform(0, 15)
-        mi = rng.uniform(10, 60)
-        total_prior = rng.randint(0, 30)
-        bug_rate = rng.uniform(0.1, 0.6)
-        hour = rng.choice([0, 1, 2, 3, 22, 23, 14, 15, 16])
-        day = rng.choice([4, 5, 6, 0, 1, 2, 3])  # bias toward Fri/weekend
-        risky_kw = rng.randint(1, 5)
-        msg_len = rng.randint(5, 40)
-        test_pct = rng.uniform(0, 0.15)
-    else:
-        # Safe commits: small, clean, business hours, experienced dev
-        lines_added = rng.randint(1, 200)
-        lines_deleted = rng.randint(0, 80)
-        files_changed = rng.randint(1, 10)
-        avg_cc = rng.uniform(1, 8)
-        max_cc = avg_cc + rng.uniform(0, 5)
-        mi = rng.uniform(60, 100)
-        total_prior = rng.randint(20, 500)
-        bug_rate = rng.uniform(0, 0.1)
-        hour = rng.randint(8, 18)
-        day = rng.randint(0, 4)  # weekday
-        risky_kw = 0 if rng.random() > 0.15 else rng.randint(1, 2)
-        msg_len = rng.randint(20, 120)
-        test_pct = rng.uniform(0.1, 0.6)
+
+
+def generate_synthetic_matrix(
+    count: int = 500,
+    positive_rate: float = 0.3,
+    seed: int = 42,
+) -> tuple:
+    """
+    Generate *count* synthetic samples directly as arrays.
+
+    Every feature is drawn column-wise with NumPy, so the cost is a few
+    dozen vectorised draws regardless of *count*.
+
+    Returns:
+        ``(X, y, shas)`` in the same layout as ``build_feature_matrix()``:
+        a Fortran-ordered ``FEATURE_DTYPE`` ``X`` with columns in ``FEATURE_COLUMNS``
+        order, an int32 label vector and the synthetic SHAs, already
+        shuffled.
+    """
+    np = _try_import_numpy()
+    rng = np.random.default_rng(seed)
+    n_risky = int(count * positive_rate)
+    n_safe = count - n_risky
+
+    def ints(risky_lo, risky_hi, safe_lo, safe_hi):
+        # Inclusive bounds, like random.randint
+        return np.concatenate([
+            rng.integers(risky_lo, risky_hi, n_risky, endpoint=True),
+            rng.integers(safe_lo, safe_hi, n_safe, endpoint=True),
+        ])
+
+    def floats(risky_lo, risky_hi, safe_lo, safe_hi):
+        return np.concatenate([
+            rng.uniform(risky_lo, risky_hi, n_risky),
+            rng.uniform(safe_lo, safe_hi, n_safe),
+        ])
+
+    # Risky commits: large, complex, odd hours, inexperienced dev.
+    # Safe commits: small, clean, business hours, experienced dev.
+    lines_added = ints(100, 1500, 1, 200)
+    lines_deleted = ints(20, 500, 0, 80)
+    files_changed = ints(5, 50, 1, 10)
+    avg_cc = floats(5, 30, 1, 8)
+    max_cc = avg_cc + floats(0, 15, 0, 5)
+    mi = floats(10, 60, 60, 100)
+    total_prior = ints(0, 30, 20, 500)
+    bug_rate = floats(0.1, 0.6, 0, 0.1)
+    hour = np.concatenate([
+        rng.choice([0, 1, 2, 3, 22, 23, 14, 15, 16], n_risky),
+        rng.integers(8, 18, n_safe, endpoint=True),
+    ])
+    day = np.concatenate([
+        rng.choice([4, 5, 6, 0, 1, 2, 3], n_risky),  # bias toward Fri/weekend
+        rng.integers(0, 4, n_safe, endpoint=True),  # weekday
+    ])
+    risky_kw = np.concatenate([
+        rng.integers(1, 5, n_risky, endpoint=True),
+        np.where(
+            rng.random(n_safe) > 0.15, 0,
+            rng.integers(1, 2, n_safe, endpoint=True),
+        ),
+    ])
+    msg_len = ints(5, 40, 20, 120)
+    test_pct = floats(0, 0.15, 0.1, 0.6)
 
     total_lines = lines_added + lines_deleted
     weekend = day >= 5
-    commit_freq = rng.uniform(0.5, 15.0)
-    time_since = rng.uniform(0.5, 200.0)
-    contributor_count = rng.randint(1, 20)
-    open_issues = rng.randint(0, 100)
-    commit_velocity = rng.uniform(1, 50)
-    file_types = rng.randint(1, min(files_changed, 8))
-    cc_blocks = rng.randint(1, files_changed * 3)
-    halstead = avg_cc * rng.uniform(10, 50)
-    python_files = rng.randint(0, files_changed)
+    commit_freq = rng.uniform(0.5, 15.0, count)
+    time_since = rng.uniform(0.5, 200.0, count)
+    contributor_count = rng.integers(1, 20, count, endpoint=True)
+    open_issues = rng.integers(0, 100, count, endpoint=True)
+    commit_velocity = rng.uniform(1, 50, count)
+    file_types = rng.integers(1, np.minimum(files_changed, 8), endpoint=True)
+    cc_blocks = rng.integers(1, files_changed * 3, endpoint=True)
+    halstead = avg_cc * rng.uniform(10, 50, count)
+    python_files = rng.integers(0, files_changed, endpoint=True)
 
     # Add some noise so the boundary isn't perfect
-    if rng.random() < 0.1:
-        # 10% noise: flip some features
-        lines_added = rng.randint(1, 1500)
-        hour = rng.randint(0, 23)
+    noise = rng.random(count) < 0.1
+    n_noise = int(noise.sum())
+    lines_added[noise] = rng.integers(1, 1500, n_noise, endpoint=True)
+    hour[noise] = rng.integers(0, 23, n_noise, endpoint=True)
 
     features = {
         "lines_added": lines_added,
@@ -119,30 +189,42 @@ def _generate_features(rng: random.Random, is_risky: bool) -> dict:
         "total_lines_changed": total_lines,
         "files_changed": files_changed,
         "file_types_count": file_types,
-        "percentage_test_files": round(test_pct, 4),
-        "avg_cyclomatic_complexity": round(avg_cc, 2),
-        "max_cyclomatic_complexity": round(max_cc, 2),
-        "avg_maintainability_index": round(mi, 2),
+        "percentage_test_files": np.round(test_pct, 4),
+        "avg_cyclomatic_complexity": np.round(avg_cc, 2),
+        "max_cyclomatic_complexity": np.round(max_cc, 2),
+        "avg_maintainability_index": np.round(mi, 2),
         "total_cc_blocks": cc_blocks,
-        "avg_halstead_volume": round(halstead, 2),
+        "avg_halstead_volume": np.round(halstead, 2),
         "complexity_python_files": python_files,
         "total_prior_commits": total_prior,
-        "previous_bug_rate": round(bug_rate, 4),
-        "commit_frequency": round(commit_freq, 4),
-        "time_since_last_commit": round(time_since, 2),
-        "repo_size": rng.randint(100, 50000),
+        "previous_bug_rate": np.round(bug_rate, 4),
+        "commit_frequency": np.round(commit_freq, 4),
+        "time_since_last_commit": np.round(time_since, 2),
+        "repo_size": rng.integers(100, 50000, count, endpoint=True),
         "contributor_count": contributor_count,
         "open_issues_count": open_issues,
-        "commit_velocity": round(commit_velocity, 2),
+        "commit_velocity": np.round(commit_velocity, 2),
         "day_of_week": day,
         "hour_of_day": hour,
         "weekend_flag": weekend,
-        "code_churn_ratio": round(lines_added / (lines_deleted + 1), 4),
-        "risk_density": round(files_changed / (total_lines + 1), 6),
-        "developer_risk_score": round(bug_rate * total_lines, 4),
+        "code_churn_ratio": np.round(lines_added / (lines_deleted + 1), 4),
+        "risk_density": np.round(files_changed / (total_lines + 1), 6),
+        "developer_risk_score": np.round(bug_rate * total_lines, 4),
         "message_length": msg_len,
         "has_risky_keywords": risky_kw > 0,
         "risky_keyword_count": risky_kw,
     }
 
-    return features
+    order = rng.permutation(count)
+    X = np.empty((count, len(FEATURE_COLUMNS)), dtype=FEATURE_DTYPE, order="F")
+    for j, col in enumerate(FEATURE_COLUMNS):
+        X[:, j] = features[col][order]
+
+    y = (order < n_risky).astype(np.int32)
+    shas = [f"synthetic_{i:06d}" for i in order.tolist()]
+
+    logger.info(
+        "Generated %d synthetic samples (%.0f%% risky).",
+        count, positive_rate * 100,
+    )
+    return X, y, shas
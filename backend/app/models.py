@@ -1,22 +1,30 @@
 import enum
 from datetime import datetime
+from typing import Optional
 
 from sqlalchemy import (
+    JSON,
     Boolean,
-    Column,
     DateTime,
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
 
 
+# Binary JSONB on PostgreSQL, JSON-as-TEXT elsewhere (SQLite).  Either way the
+# attribute holds a dict; SQL NULL (not JSON 'null') when set to None.
+JSONDocument = JSON(none_as_null=True).with_variant(JSONB(none_as_null=True), "postgresql")
+
+
 class RiskLevel(str, enum.Enum):
     LOW = "LOW"
     MEDIUM = "MEDIUM"
@@ -26,19 +34,19 @@ class RiskLevel(str, enum.Enum):
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(Integer, primary_key=True, index=True)
-    clerk_user_id = Column(String(128), unique=True, nullable=True, index=True)
-    github_id = Column(Integer, unique=True, nullable=True, index=True)
-    google_id = Column(String(50), unique=True, nullable=True, index=True)
-    username = Column(String(100), unique=True, nullable=False, index=True)
-    email = Column(String(255), unique=True, nullable=True)
-    avatar_url = Column(String(500), nullable=True)
-    access_token = Column(Text, nullable=True)
-    is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    clerk_user_id: Mapped[Optional[str]] = mapped_column(String(128), unique=True, nullable=True, index=True)
+    github_id: Mapped[Optional[int]] = mapped_column(Integer, unique=True, nullable=True, index=True)
+    google_id: Mapped[Optional[str]] = mapped_column(String(50), unique=True, nullable=True, index=True)
+    username: Mapped[str] = mapped_column(String(100), unique=True, nullable=False, index=True)
+    email: Mapped[Optional[str]] = mapped_column(String(255), unique=True, nullable=True)
+    avatar_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    access_token: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    is_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    repositories = relationship("Repository", back_populates="owner", cascade="all, delete-orphan")
+    repositories: Mapped[list["Repository"]] = relationship(back_populates="owner", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<User id={self.id} username={self.username}>"
@@ -47,19 +55,19 @@ class User(Base):
 class Repository(Base):
     __tablename__ = "repositories"
 
-    id = Column(Integer, primary_key=True, index=True)
-    github_repo_id = Column(Integer, unique=True, nullable=False, index=True)
-    name = Column(String(255), nullable=False)
-    full_name = Column(String(500), nullable=False, unique=True)
-    description = Column(Text, nullable=True)
-    is_private = Column(Boolean, default=False)
-    webhook_active = Column(Boolean, default=False)
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    github_repo_id: Mapped[int] = mapped_column(Integer, unique=True, nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    full_name: Mapped[str] = mapped_column(String(500), nullable=False, unique=True)
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    is_private: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    webhook_active: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    owner_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
-    owner = relationship("User", back_populates="repositories")
-    commits = relationship("Commit", back_populates="repository", cascade="all, delete-orphan")
+    owner: Mapped["User"] = relationship(back_populates="repositories")
+    commits: Mapped[list["Commit"]] = relationship(back_populates="repository", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<Repository id={self.id} full_name={self.full_name}>"
@@ -67,26 +75,36 @@ class Repository(Base):
 
 class Commit(Base):
     __tablename__ = "commits"
-
-    id = Column(Integer, primary_key=True, index=True)
-    sha = Column(String(40), nullable=False, index=True)
-    message = Column(Text, nullable=True)
-    author_name = Column(String(255), nullable=True)
-    author_email = Column(String(255), nullable=True)
-    lines_added = Column(Integer, default=0)
-    lines_deleted = Column(Integer, default=0)
-    files_changed = Column(Integer, default=0)
-    # Complexity metrics (populated by radon analysis)
-    avg_cyclomatic_complexity = Column(Float, nullable=True)
-    max_cyclomatic_complexity = Column(Float, nullable=True)
-    avg_maintainability_index = Column(Float, nullable=True)
-    complexity_rank = Column(String(2), nullable=True)  # A-F
-    repository_id = Column(Integer, ForeignKey("repositories.id"), nullable=False)
-    committed_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-
-    repository = relationship("Repository", back_populates="commits")
-    risk_assessment = relationship("RiskAssessment", back_populates="commit", uselist=False)
+    __table_args__ = (
+        # Per-repository commit listings / scans ordered by time; also serves
+        # plain ``repository_id`` lookups as its leading column.
+        Index("ix_commit_repo_time", "repository_id", "committed_at"),
+        # Dashboard commit table: ORDER BY created_at, id and its keyset
+        # cursor, unfiltered and per repository.
+        Index("ix_commit_created", "created_at", "id"),
+        Index("ix_commit_repo_created", "repository_id", "created_at", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    sha: Mapped[str] = mapped_column(String(40), nullable=False, index=True)
+    message: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    author_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    author_email: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    lines_added: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    lines_deleted: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    files_changed: Mapped[Optional[int]] = mapped_column(Integer, default=0)
+    # Complexity metrics (populated by radon analysis).  Single precision
+    # (REAL) is ample for radon's one-decimal output.
+    avg_cyclomatic_complexity: Mapped[Optional[float]] = mapped_column(Float(precision=24), nullable=True)
+    max_cyclomatic_complexity: Mapped[Optional[float]] = mapped_column(Float(precision=24), nullable=True)
+    avg_maintainability_index: Mapped[Optional[float]] = mapped_column(Float(precision=24), nullable=True)
+    complexity_rank: Mapped[Optional[str]] = mapped_column(String(2), nullable=True, index=False)  # A-F
+    repository_id: Mapped[int] = mapped_column(Integer, ForeignKey("repositories.id"), nullable=False)
+    committed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+
+    repository: Mapped["Repository"] = relationship(back_populates="commits")
+    risk_assessment: Mapped[Optional["RiskAssessment"]] = relationship(back_populates="commit", uselist=False)
 
     def __repr__(self):
         return f"<Commit sha={self.sha[:7]} repo_id={self.repository_id}>"
@@ -95,17 +113,17 @@ class Commit(Base):
 class RiskAssessment(Base):
     __tablename__ = "risk_assessments"
 
-    id = Column(Integer, primary_key=True, index=True)
-    commit_id = Column(Integer, ForeignKey("commits.id"), nullable=False, unique=True)
-    risk_score = Column(Float, nullable=False)  # 0.0 – 100.0
-    risk_level = Column(Enum(RiskLevel), nullable=False)
-    confidence = Column(Float, nullable=True)  # 0.0 – 1.0
-    features_json = Column(Text, nullable=True)  # raw ML features (JSON string)
-    score_breakdown_json = Column(Text, nullable=True)  # per-category score breakdown
-    model_version = Column(String(50), default="rule-v1")
-    created_at = Column(DateTime, default=datetime.utcnow)
-
-    commit = relationship("Commit", back_populates="risk_assessment")
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    commit_id: Mapped[int] = mapped_column(Integer, ForeignKey("commits.id"), nullable=False, unique=True)
+    risk_score: Mapped[float] = mapped_column(Float, nullable=False)  # 0.0 – 100.0
+    risk_level: Mapped[RiskLevel] = mapped_column(Enum(RiskLevel), nullable=False)
+    confidence: Mapped[Optional[float]] = mapped_column(Float, nullable=True)  # 0.0 – 1.0
+    features_json: Mapped[Optional[dict]] = mapped_column(JSONDocument, nullable=True)  # raw ML features
+    score_breakdown_json: Mapped[Optional[dict]] = mapped_column(JSONDocument, nullable=True)  # per-category score breakdown
+    model_version: Mapped[Optional[str]] = mapped_column(String(50), default="rule-v1")
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=datetime.utcnow)
+
+    commit: Mapped["Commit"] = relationship(back_populates="risk_assessment")
 
     def __repr__(self):
         return f"<RiskAssessment commit_id={self.commit_id} score={self.risk_score} level={self.risk_level}>"
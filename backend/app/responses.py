@@ -0,0 +1,21 @@
+"""
+Response classes shared by routers and exception handlers.
+
+Routes that declare a ``response_model`` are serialised by FastAPI through
+pydantic-core already and should keep the default response class.  Use
+:class:`ORJSONResponse` for handlers that return plain dicts / lists.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+class ORJSONResponse(JSONResponse):
+    """``JSONResponse`` rendered with orjson (Rust) instead of stdlib ``json``."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
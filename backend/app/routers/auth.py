@@ -22,24 +22,53 @@ Protected routes use Depends(get_current_user) from app.dependencies.
 
 from __future__ import annotations
 
-from urllib.parse import urlencode
+import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+from urllib.parse import quote_plus, urlencode
 
 import httpx
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import RedirectResponse
+from pydantic import TypeAdapter
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.config import get_settings
-from app.database import get_db
-from app.dependencies import get_current_user
+from app.database import IS_SQLITE, DbSession
+from app.dependencies import HttpClient, _unique_username, get_current_user
 from app.models import User
 from app.schemas import GitHubLoginURL, GitHubUserRepoItem, TokenResponse, UserResponse
-from app.services.auth import create_access_token, decrypt_token, encrypt_token
-from app.services.github import fetch_user_repos
+from app.services.auth import create_access_token, decrypt_token_cached, encrypt_token
+from app.services.github import fetch_user_repos_if_changed
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
 settings = get_settings()
 
+# Dialect-specific INSERT, for ON CONFLICT upserts
+_insert = sqlite_insert if IS_SQLITE else pg_insert
+
+# Validates a raw GitHub /user/repos page in one call
+_REPO_LIST_ADAPTER = TypeAdapter(list[GitHubUserRepoItem])
+
+# Last /user/repos page served per (user id, page, per_page): GitHub's ETag
+# and the JSON body sent to the client.  Each request revalidates with
+# If-None-Match; a 304 replays the stored body with no parse / validation.
+# list_github_repos is sync (threadpool), hence the lock.
+_REPOS_TTL_SECONDS = 1800
+_REPOS_CACHE_SIZE = 1_000
+_repos_cache: OrderedDict[tuple[int, int, int], tuple[float, str, bytes]] = OrderedDict()
+_repos_lock = threading.Lock()
+
 GITHUB_AUTHORIZE_URL = "https://github.com/login/oauth/authorize"
 GITHUB_TOKEN_URL = "https://github.com/login/oauth/access_token"
 GITHUB_USER_URL = "https://api.github.com/user"
@@ -48,30 +77,129 @@ GITHUB_EMAILS_URL = "https://api.github.com/user/emails"
 # Scopes: read user profile, access email, and (optionally) read repos for webhooks
 GITHUB_SCOPES = "read:user user:email repo"
 
+# Static headers for GitHub REST calls; only Authorization varies per user.
+# Kept as an httpx.Headers so each call copies the already-normalised pairs.
+_GITHUB_API_HEADERS = httpx.Headers({
+    "Accept": "application/vnd.github+json",
+    "X-GitHub-Api-Version": "2022-11-28",
+})
+_GITHUB_TOKEN_HEADERS = {
+    "Accept": "application/json",
+    "Content-Type": "application/x-www-form-urlencoded",
+}
+
+# Recently fetched OAuth profiles keyed by a digest of provider + access
+# token (never the token itself), so a repeat login with the same token
+# skips the profile round-trips.  Only touched from the event loop — the
+# async callbacks — so no lock is needed.
+_PROFILE_TTL_SECONDS = 300
+_PROFILE_CACHE_SIZE = 10_000
+_profile_cache: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+
 GOOGLE_AUTHORIZE_URL = "https://accounts.google.com/o/oauth2/v2/auth"
 GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
 GOOGLE_USER_URL = "https://www.googleapis.com/oauth2/v3/userinfo"
 GOOGLE_SCOPES = "openid email profile"
 
+# Insert attempts for a new user before a username clash is reported.
+_USERNAME_ATTEMPTS = 3
+
+# Authorize URLs depend only on settings, so they are built once at import;
+# ``None`` when the provider isn't configured (the endpoints then 503).
+_GITHUB_LOGIN_URL: Optional[str] = (
+    f"{GITHUB_AUTHORIZE_URL}?" + urlencode({
+        "client_id": settings.GITHUB_CLIENT_ID,
+        "scope": GITHUB_SCOPES,
+        "allow_signup": "true",
+    })
+    if settings.GITHUB_CLIENT_ID else None
+)
+_GOOGLE_LOGIN_URL: Optional[str] = (
+    f"{GOOGLE_AUTHORIZE_URL}?" + urlencode({
+        "client_id": settings.GOOGLE_CLIENT_ID,
+        "redirect_uri": settings.GOOGLE_REDIRECT_URI,
+        "response_type": "code",
+        "scope": GOOGLE_SCOPES,
+        "access_type": "offline",
+        "prompt": "select_account",
+    })
+    if settings.GOOGLE_CLIENT_ID else None
+)
+
+# Token-exchange form bodies: only the trailing ``code`` varies per request,
+# so the constant fields are urlencoded once and the code appended to them.
+_FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+_GITHUB_TOKEN_BODY_PREFIX = urlencode({
+    "client_id": settings.GITHUB_CLIENT_ID,
+    "client_secret": settings.GITHUB_CLIENT_SECRET,
+}) + "&code="
+_GOOGLE_TOKEN_BODY_PREFIX = urlencode({
+    "client_id": settings.GOOGLE_CLIENT_ID,
+    "client_secret": settings.GOOGLE_CLIENT_SECRET,
+    "redirect_uri": settings.GOOGLE_REDIRECT_URI,
+    "grant_type": "authorization_code",
+}) + "&code="
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _exchange_code_for_token(code: str) -> str:
+def _profile_key(provider: str, access_token: str) -> bytes:
+    return hashlib.blake2b(
+        f"{provider}:{access_token}".encode(), digest_size=16
+    ).digest()
+
+
+def _cached_profile(key: bytes) -> Optional[dict]:
+    """Return a copy of a still-fresh cached profile, else ``None``."""
+    hit = _profile_cache.get(key)
+    if hit is None:
+        return None
+    if hit[0] > time.monotonic():
+        _profile_cache.move_to_end(key)
+        return dict(hit[1])
+    del _profile_cache[key]
+    return None
+
+
+def _store_profile(key: bytes, profile: dict) -> None:
+    _profile_cache[key] = (time.monotonic() + _PROFILE_TTL_SECONDS, dict(profile))
+    _profile_cache.move_to_end(key)
+    if len(_profile_cache) > _PROFILE_CACHE_SIZE:
+        _profile_cache.popitem(last=False)
+
+
+def _cached_repos_page(key: tuple[int, int, int]) -> Optional[tuple[str, bytes]]:
+    """Return ``(etag, body)`` of a still-fresh cached repos page, else ``None``."""
+    with _repos_lock:
+        hit = _repos_cache.get(key)
+        if hit is None:
+            return None
+        if hit[0] > time.monotonic():
+            _repos_cache.move_to_end(key)
+            return hit[1], hit[2]
+        del _repos_cache[key]
+        return None
+
+
+def _store_repos_page(key: tuple[int, int, int], etag: str, body: bytes) -> None:
+    with _repos_lock:
+        _repos_cache[key] = (time.monotonic() + _REPOS_TTL_SECONDS, etag, body)
+        _repos_cache.move_to_end(key)
+        if len(_repos_cache) > _REPOS_CACHE_SIZE:
+            _repos_cache.popitem(last=False)
+
+
+async def _exchange_code_for_token(client: httpx.AsyncClient, code: str) -> str:
     """POST the OAuth code to GitHub and return the raw access token string."""
-    with httpx.Client(timeout=15) as client:
-        resp = client.post(
-            GITHUB_TOKEN_URL,
-            headers={"Accept": "application/json"},
-            data={
-                "client_id": settings.GITHUB_CLIENT_ID,
-                "client_secret": settings.GITHUB_CLIENT_SECRET,
-                "code": code,
-            },
-        )
+    resp = await client.post(
+        GITHUB_TOKEN_URL,
+        headers=_GITHUB_TOKEN_HEADERS,
+        content=(_GITHUB_TOKEN_BODY_PREFIX + quote_plus(code)).encode(),
+    )
     resp.raise_for_status()
-    data = resp.json()
+    data = orjson.loads(resp.content)
     token = data.get("access_token")
     if not token:
         error = data.get("error_description") or data.get("error") or "Unknown error"
@@ -82,63 +210,76 @@ def _exchange_code_for_token(code: str) -> str:
     return token
 
 
-def _fetch_github_user(access_token: str) -> dict:
-    """Fetch the authenticated user's profile from GitHub API."""
-    headers = {
-        "Authorization": f"Bearer {access_token}",
-        "Accept": "application/vnd.github+json",
-        "X-GitHub-Api-Version": "2022-11-28",
-    }
-    with httpx.Client(timeout=15) as client:
-        resp = client.get(GITHUB_USER_URL, headers=headers)
-        resp.raise_for_status()
-        user_data = resp.json()
-
-        # GitHub hides the email on the /user endpoint when it is private.
-        # We do a secondary call to /user/emails to get the primary address.
-        if not user_data.get("email"):
-            emails_resp = client.get(GITHUB_EMAILS_URL, headers=headers)
-            if emails_resp.status_code == 200:
-                emails = emails_resp.json()
-                primary = next(
-                    (e["email"] for e in emails if e.get("primary") and e.get("verified")),
-                    None,
-                )
-                user_data["email"] = primary
-
+async def _fetch_github_user(client: httpx.AsyncClient, access_token: str) -> dict:
+    """Fetch the authenticated user's profile from GitHub API (cached per token)."""
+    key = _profile_key("github", access_token)
+    cached = _cached_profile(key)
+    if cached is not None:
+        return cached
+
+    headers = _GITHUB_API_HEADERS.copy()
+    headers["Authorization"] = f"Bearer {access_token}"
+    # GitHub hides the email on the /user endpoint when it is private, so the
+    # primary address may have to come from /user/emails.  Both are requested
+    # concurrently; the emails response is simply unused when /user has one.
+    resp, emails_resp = await asyncio.gather(
+        client.get(GITHUB_USER_URL, headers=headers),
+        client.get(GITHUB_EMAILS_URL, headers=headers),
+        return_exceptions=True,
+    )
+    if isinstance(resp, BaseException):
+        raise resp
+    resp.raise_for_status()
+    user_data = orjson.loads(resp.content)
+
+    if not user_data.get("email"):
+        if isinstance(emails_resp, httpx.Response) and emails_resp.status_code == 200:
+            emails = orjson.loads(emails_resp.content)
+            primary = next(
+                (e["email"] for e in emails if e.get("primary") and e.get("verified")),
+                None,
+            )
+            user_data["email"] = primary
+
+    _store_profile(key, user_data)
     return user_data
 
 
-def _upsert_user(gh: dict, access_token: str, db: Session) -> User:
+def _upsert_user(gh: dict, access_token: str, db: Session) -> int:
     """
-    Create or update a User record from GitHub profile data.
-    The access token is encrypted before being stored.
+    Create or update a User record from GitHub profile data and return its
+    primary key.  The access token is encrypted before being stored.
+
+    One ``INSERT … ON CONFLICT (github_id) DO UPDATE … RETURNING id``
+    round-trip; the row itself (encrypted token included) is never read back.
     """
     encrypted = encrypt_token(access_token)
 
-    user = db.query(User).filter(User.github_id == gh["id"]).first()
-
-    if user:
-        # Update mutable fields on every login
-        user.username = gh["login"]
-        user.email = gh.get("email") or user.email
-        user.avatar_url = gh.get("avatar_url")
-        user.access_token = encrypted
-        user.is_active = True
-    else:
-        user = User(
-            github_id=gh["id"],
-            username=gh["login"],
-            email=gh.get("email"),
-            avatar_url=gh.get("avatar_url"),
-            access_token=encrypted,
-            is_active=True,
-        )
-        db.add(user)
-
+    stmt = _insert(User).values(
+        github_id=gh["id"],
+        username=gh["login"],
+        email=gh.get("email"),
+        avatar_url=gh.get("avatar_url"),
+        access_token=encrypted,
+        is_active=True,
+    )
+    # Mutable fields refreshed on every login; ON CONFLICT skips the
+    # ORM-side onupdate, so updated_at is set explicitly.
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[User.github_id],
+        set_={
+            "username": stmt.excluded.username,
+            "email": func.coalesce(stmt.excluded.email, User.email),
+            "avatar_url": stmt.excluded.avatar_url,
+            "access_token": stmt.excluded.access_token,
+            "is_active": True,
+            "updated_at": datetime.utcnow(),
+        },
+    ).returning(User.id)
+
+    user_id = db.scalars(stmt).one()
     db.commit()
-    db.refresh(user)
-    return user
+    return user_id
 
 
 # ---------------------------------------------------------------------------
@@ -160,19 +301,13 @@ def github_login():
 
     To initiate a direct browser redirect instead add ``?redirect=true``.
     """
-    if not settings.GITHUB_CLIENT_ID:
+    if _GITHUB_LOGIN_URL is None:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="GitHub OAuth is not configured. Set GITHUB_CLIENT_ID in .env.",
         )
 
-    params = urlencode({
-        "client_id": settings.GITHUB_CLIENT_ID,
-        "scope": GITHUB_SCOPES,
-        "allow_signup": "true",
-    })
-    url = f"{GITHUB_AUTHORIZE_URL}?{params}"
-    return GitHubLoginURL(url=url)
+    return GitHubLoginURL(url=_GITHUB_LOGIN_URL)
 
 
 @router.get(
@@ -185,27 +320,23 @@ def github_login_redirect():
     Convenience endpoint that immediately redirects the browser to GitHub.
     Useful when the frontend embeds an ``<a href>`` to this endpoint.
     """
-    if not settings.GITHUB_CLIENT_ID:
+    if _GITHUB_LOGIN_URL is None:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="GitHub OAuth is not configured.",
         )
 
-    params = urlencode({
-        "client_id": settings.GITHUB_CLIENT_ID,
-        "scope": GITHUB_SCOPES,
-        "allow_signup": "true",
-    })
-    return RedirectResponse(url=f"{GITHUB_AUTHORIZE_URL}?{params}")
+    return RedirectResponse(url=_GITHUB_LOGIN_URL)
 
 
 @router.get(
     "/github/callback",
     summary="GitHub OAuth callback — exchanges code for JWT",
 )
-def github_callback(
+async def github_callback(
+    db: DbSession,
+    http: HttpClient,
     code: str = Query(..., description="OAuth code provided by GitHub"),
-    db: Session = Depends(get_db),
 ):
     """
     GitHub redirects here after the user authorises (or denies) the app.
@@ -226,7 +357,7 @@ def github_callback(
 
     # 1. Exchange code for GitHub token
     try:
-        gh_access_token = _exchange_code_for_token(code)
+        gh_access_token = await _exchange_code_for_token(http, code)
     except httpx.HTTPStatusError as exc:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
@@ -235,18 +366,19 @@ def github_callback(
 
     # 2. Fetch GitHub user
     try:
-        gh_user = _fetch_github_user(gh_access_token)
+        gh_user = await _fetch_github_user(http, gh_access_token)
     except httpx.HTTPStatusError as exc:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Failed to fetch GitHub user: {exc}",
         )
 
-    # 3. Upsert user (encrypted token stored in DB)
-    user = _upsert_user(gh_user, gh_access_token, db)
+    # 3. Upsert user (encrypted token stored in DB) — blocking DB I/O, so
+    #    it runs in the threadpool rather than on the event loop
+    user_id = await run_in_threadpool(_upsert_user, gh_user, gh_access_token, db)
 
     # 4. Issue JWT
-    jwt_token = create_access_token(subject=user.id)
+    jwt_token = create_access_token(subject=user_id)
 
     # 5. Redirect frontend with token
     redirect_url = f"{settings.FRONTEND_URL}/auth/callback?token={jwt_token}"
@@ -290,42 +422,44 @@ def list_github_repos(
         )
 
     try:
-        github_token = decrypt_token(current_user.access_token)
+        github_token = decrypt_token_cached(current_user.access_token)
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Could not decrypt GitHub token — please re-authenticate.",
         )
 
+    cache_key = (current_user.id, page, per_page)
+    cached = _cached_repos_page(cache_key)
+
     try:
-        raw = fetch_user_repos(github_token, per_page=per_page, page=page)
+        raw, etag = fetch_user_repos_if_changed(
+            github_token,
+            etag=cached[0] if cached else None,
+            per_page=per_page,
+            page=page,
+        )
     except Exception as exc:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Failed to fetch GitHub repositories: {exc}",
         )
 
-    return [
-        GitHubUserRepoItem(
-            id=r["id"],
-            name=r["name"],
-            full_name=r["full_name"],
-            description=r.get("description"),
-            private=r.get("private", False),
-            html_url=r.get("html_url", ""),
-            language=r.get("language"),
-            stargazers_count=r.get("stargazers_count", 0),
-            forks_count=r.get("forks_count", 0),
-            open_issues_count=r.get("open_issues_count", 0),
-            default_branch=r.get("default_branch", "main"),
-            updated_at=r.get("updated_at"),
-            created_at=r.get("created_at"),
-            topics=r.get("topics") or [],
-            fork=r.get("fork", False),
-            archived=r.get("archived", False),
-        )
-        for r in raw
-    ]
+    if raw is None and cached is not None:
+        # 304 Not Modified — the page we served last time is still current
+        body = cached[1]
+    else:
+        # One pydantic-core pass over the whole page instead of a constructor
+        # call (and kwargs dict) per repository, then serialised straight to
+        # JSON bytes — returning a Response skips FastAPI's re-validation
+        # against response_model (kept for the OpenAPI schema) and its
+        # json.dumps render.
+        repos = _REPO_LIST_ADAPTER.validate_python(raw)
+        body = _REPO_LIST_ADAPTER.dump_json(repos)
+        if etag:
+            _store_repos_page(cache_key, etag, body)
+
+    return Response(content=body, media_type="application/json")
 
 
 @router.post(
@@ -348,31 +482,15 @@ def logout(_: User = Depends(get_current_user)):
 # Google OAuth helpers
 # ---------------------------------------------------------------------------
 
-def _google_redirect_uri() -> str:
-    """Return the callback URL registered with Google OAuth.
-
-    Uses the GOOGLE_REDIRECT_URI setting, which is auto-derived from
-    FRONTEND_URL when left blank (see Settings model_validator).
-    """
-    return settings.GOOGLE_REDIRECT_URI
-
-
-def _exchange_google_code_for_token(code: str) -> str:
+async def _exchange_google_code_for_token(client: httpx.AsyncClient, code: str) -> str:
     """POST the OAuth code to Google and return the raw access token string."""
-    redirect_uri = _google_redirect_uri()
-    with httpx.Client(timeout=15) as client:
-        resp = client.post(
-            GOOGLE_TOKEN_URL,
-            data={
-                "code": code,
-                "client_id": settings.GOOGLE_CLIENT_ID,
-                "client_secret": settings.GOOGLE_CLIENT_SECRET,
-                "redirect_uri": redirect_uri,
-                "grant_type": "authorization_code",
-            },
-        )
+    resp = await client.post(
+        GOOGLE_TOKEN_URL,
+        headers=_FORM_HEADERS,
+        content=(_GOOGLE_TOKEN_BODY_PREFIX + quote_plus(code)).encode(),
+    )
     resp.raise_for_status()
-    data = resp.json()
+    data = orjson.loads(resp.content)
     token = data.get("access_token")
     if not token:
         error = data.get("error_description") or data.get("error") or "Unknown error"
@@ -383,21 +501,27 @@ def _exchange_google_code_for_token(code: str) -> str:
     return token
 
 
-def _fetch_google_user(access_token: str) -> dict:
-    """Fetch the authenticated user's profile from Google."""
-    with httpx.Client(timeout=15) as client:
-        resp = client.get(
-            GOOGLE_USER_URL,
-            headers={"Authorization": f"Bearer {access_token}"},
-        )
-        resp.raise_for_status()
-    return resp.json()
+async def _fetch_google_user(client: httpx.AsyncClient, access_token: str) -> dict:
+    """Fetch the authenticated user's profile from Google (cached per token)."""
+    key = _profile_key("google", access_token)
+    cached = _cached_profile(key)
+    if cached is not None:
+        return cached
+
+    resp = await client.get(
+        GOOGLE_USER_URL,
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+    resp.raise_for_status()
+    profile = orjson.loads(resp.content)
+    _store_profile(key, profile)
+    return profile
 
 
-def _upsert_google_user(google_profile: dict, access_token: str, db: Session) -> User:
+def _upsert_google_user(google_profile: dict, access_token: str, db: Session) -> int:
     """
-    Create or update a User record from Google profile data.
-    Uses `sub` (Google's stable user ID) as the lookup key.
+    Create or update a User record from Google profile data and return its
+    primary key.  Uses `sub` (Google's stable user ID) as the lookup key.
     """
     encrypted = encrypt_token(access_token)
     google_id = str(google_profile["sub"])
@@ -408,34 +532,46 @@ def _upsert_google_user(google_profile: dict, access_token: str, db: Session) ->
     # Derive a username from the email prefix or name
     username_base = (email.split("@")[0] if email else name.replace(" ", "").lower()) or f"google_{google_id}"
 
-    user = db.query(User).filter(User.google_id == google_id).first()
+    # Returning user: one UPDATE … RETURNING round-trip
+    returning = (
+        update(User)
+        .where(User.google_id == google_id)
+        .values(
+            email=func.coalesce(email, User.email),
+            avatar_url=func.coalesce(picture, User.avatar_url),
+            access_token=encrypted,
+            is_active=True,
+        )
+        .returning(User.id)
+    )
 
-    if user:
-        user.email = email or user.email
-        user.avatar_url = picture or user.avatar_url
-        user.access_token = encrypted
-        user.is_active = True
-    else:
-        # Ensure username is unique by appending a suffix if needed
-        username = username_base
-        suffix = 1
-        while db.query(User).filter(User.username == username).first():
-            username = f"{username_base}{suffix}"
-            suffix += 1
+    for attempt in range(_USERNAME_ATTEMPTS):
+        user_id = db.scalars(returning).one_or_none()
+        if user_id is not None:
+            db.commit()
+            return user_id
 
+        # First sign-in: needs a free username before the INSERT
         user = User(
             google_id=google_id,
-            username=username,
+            username=_unique_username(username_base, db),
             email=email,
             avatar_url=picture,
             access_token=encrypted,
             is_active=True,
         )
         db.add(user)
-
-    db.commit()
-    db.refresh(user)
-    return user
+        try:
+            db.flush()
+            user_id = user.id
+            db.commit()
+            return user_id
+        except IntegrityError:
+            # A concurrent sign-in took the username (or created this Google
+            # user) between the lookup and the INSERT — re-read and retry.
+            db.rollback()
+            if attempt == _USERNAME_ATTEMPTS - 1:
+                raise
 
 
 # ---------------------------------------------------------------------------
@@ -449,31 +585,23 @@ def _upsert_google_user(google_profile: dict, access_token: str, db: Session) ->
 )
 def google_login_redirect():
     """Immediately redirects the browser to Google's OAuth consent screen."""
-    if not settings.GOOGLE_CLIENT_ID:
+    if _GOOGLE_LOGIN_URL is None:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail="Google OAuth is not configured. Set GOOGLE_CLIENT_ID in .env.",
         )
 
-    redirect_uri = _google_redirect_uri()
-    params = urlencode({
-        "client_id": settings.GOOGLE_CLIENT_ID,
-        "redirect_uri": redirect_uri,
-        "response_type": "code",
-        "scope": GOOGLE_SCOPES,
-        "access_type": "offline",
-        "prompt": "select_account",
-    })
-    return RedirectResponse(url=f"{GOOGLE_AUTHORIZE_URL}?{params}")
+    return RedirectResponse(url=_GOOGLE_LOGIN_URL)
 
 
 @router.get(
     "/google/callback",
     summary="Google OAuth callback — exchanges code for JWT",
 )
-def google_callback(
+async def google_callback(
+    db: DbSession,
+    http: HttpClient,
     code: str = Query(..., description="OAuth code provided by Google"),
-    db: Session = Depends(get_db),
 ):
     """
     Google redirects here after the user authorises the app.
@@ -492,7 +620,7 @@ def google_callback(
         )
 
     try:
-        google_access_token = _exchange_google_code_for_token(code)
+        google_access_token = await _exchange_google_code_for_token(http, code)
     except httpx.HTTPStatusError as exc:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
@@ -500,15 +628,17 @@ def google_callback(
         )
 
     try:
-        google_user = _fetch_google_user(google_access_token)
+        google_user = await _fetch_google_user(http, google_access_token)
     except httpx.HTTPStatusError as exc:
         raise HTTPException(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"Failed to fetch Google user: {exc}",
         )
 
-    user = _upsert_google_user(google_user, google_access_token, db)
-    jwt_token = create_access_token(subject=user.id)
+    user_id = await run_in_threadpool(
+        _upsert_google_user, google_user, google_access_token, db
+    )
+    jwt_token = create_access_token(subject=user_id)
 
     redirect_url = f"{settings.FRONTEND_URL}/auth/callback?token={jwt_token}"
     return RedirectResponse(url=redirect_url, status_code=status.HTTP_302_FOUND)
@@ -5,18 +5,41 @@ Provides aggregated metrics consumed by the frontend dashboard cards
 and risk distribution charts.
 """
 
+import base64
+import binascii
 import logging
 from datetime import datetime, timedelta, timezone
+from typing import Optional
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Query
+from sqlalchemy import case, func, literal_column, select, tuple_
+from sqlalchemy.orm import joinedload, selectinload
 
-from app.database import get_db
+from app.database import DbSession
+from app.exceptions import ValidationError
 from app.models import Commit, Repository, RiskAssessment, RiskLevel
+from app.responses import ORJSONResponse
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
+router = APIRouter(
+    prefix="/dashboard",
+    tags=["Dashboard"],
+    default_response_class=ORJSONResponse,
+)
+
+# Score histogram: ten buckets of width 10 over [0, 100), computed in one
+# GROUP BY.  CASE rather than floor()/CAST so the binning is identical on
+# SQLite and PostgreSQL (the latter rounds when casting float → int).  The
+# bounds are inlined as literals: with server-side binding (psycopg 3) the
+# SELECT and GROUP BY copies would otherwise carry distinct parameters and
+# PostgreSQL would not treat them as the same expression.
+_HISTOGRAM_BUCKETS = tuple((lo, lo + 10) for lo in range(0, 100, 10))
+_HISTOGRAM_BUCKET = case(
+    *(
+        (RiskAssessment.risk_score < literal_column(str(hi)), literal_column(str(i)))
+        for i, (_, hi) in enumerate(_HISTOGRAM_BUCKETS)
+    )
+).label("bucket")
 
 
 # ---------------------------------------------------------------------------
@@ -24,7 +47,7 @@ router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 # ---------------------------------------------------------------------------
 
 @router.get("/stats")
-def dashboard_stats(db: Session = Depends(get_db)):
+def dashboard_stats(db: DbSession):
     """
     Return aggregate statistics for the dashboard overview cards.
 
@@ -41,39 +64,45 @@ def dashboard_stats(db: Session = Depends(get_db)):
             "recent_high_risk_24h": int,
         }
     """
-    total_repos = db.query(func.count(Repository.id)).scalar() or 0
-    total_commits = db.query(func.count(Commit.id)).scalar() or 0
-    total_assessments = db.query(func.count(RiskAssessment.id)).scalar() or 0
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
 
-    # Risk level breakdown
-    risk_counts = {"LOW": 0, "MEDIUM": 0, "HIGH": 0}
-    rows = (
-        db.query(RiskAssessment.risk_level, func.count(RiskAssessment.id))
-        .group_by(RiskAssessment.risk_level)
-        .all()
+    # One round-trip: the repository / commit counts ride along as scalar
+    # subqueries, the assessment metrics are conditional aggregates over a
+    # single scan of risk_assessments.
+    row = (
+        db.query(
+            select(func.count(Repository.id)).scalar_subquery(),
+            select(func.count(Commit.id)).scalar_subquery(),
+            select(func.count(Commit.id))
+            .where(Commit.created_at >= cutoff)
+            .scalar_subquery(),
+            func.count(RiskAssessment.id),
+            func.avg(RiskAssessment.risk_score),
+            *(
+                func.sum(case((RiskAssessment.risk_level == level, 1), else_=0))
+                for level in (RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH)
+            ),
+            func.sum(case(
+                (
+                    (RiskAssessment.created_at >= cutoff)
+                    & (RiskAssessment.risk_level == RiskLevel.HIGH),
+                    1,
+                ),
+                else_=0,
+            )),
+        )
+        .select_from(RiskAssessment)
+        .one()
     )
-    for level, count in rows:
-        key = level.value if isinstance(level, RiskLevel) else str(level)
-        risk_counts[key] = count
-
-    avg_score = db.query(func.avg(RiskAssessment.risk_score)).scalar()
-    high_risk_count = risk_counts.get("HIGH", 0)
+    (
+        total_repos, total_commits, recent_commits, total_assessments,
+        avg_score, low, medium, high, recent_high,
+    ) = row
 
-    # Last 24 hours
-    cutoff = datetime.now(timezone.utc) - timedelta(hours=24)
-    recent_commits = (
-        db.query(func.count(Commit.id))
-        .filter(Commit.created_at >= cutoff)
-        .scalar()
-    ) or 0
-    recent_high = (
-        db.query(func.count(RiskAssessment.id))
-        .filter(
-            RiskAssessment.created_at >= cutoff,
-            RiskAssessment.risk_level == RiskLevel.HIGH,
-        )
-        .scalar()
-    ) or 0
+    # Risk level breakdown
+    risk_counts = {"LOW": low or 0, "MEDIUM": medium or 0, "HIGH": high or 0}
+    high_risk_count = risk_counts["HIGH"]
+    recent_high = recent_high or 0
 
     return {
         "total_repositories": total_repos,
@@ -92,7 +121,7 @@ def dashboard_stats(db: Session = Depends(get_db)):
 # ---------------------------------------------------------------------------
 
 @router.get("/risk-distribution")
-def risk_distribution(db: Session = Depends(get_db)):
+def risk_distribution(db: DbSession):
     """
     Return risk distribution data suitable for pie/bar charts.
 
@@ -108,20 +137,20 @@ def risk_distribution(db: Session = Depends(get_db)):
             "score_histogram": [...]
         }
     """
-    total = db.query(func.count(RiskAssessment.id)).scalar() or 0
     rows = (
         db.query(RiskAssessment.risk_level, func.count(RiskAssessment.id))
         .group_by(RiskAssessment.risk_level)
         .all()
     )
+    by_level = {
+        (level.value if isinstance(level, RiskLevel) else str(level)): c
+        for level, c in rows
+    }
+    total = sum(by_level.values())
 
     distribution = []
     for level_name in ("LOW", "MEDIUM", "HIGH"):
-        count = 0
-        for level, c in rows:
-            key = level.value if isinstance(level, RiskLevel) else str(level)
-            if key == level_name:
-                count = c
+        count = by_level.get(level_name, 0)
         distribution.append({
             "level": level_name,
             "count": count,
@@ -129,16 +158,17 @@ def risk_distribution(db: Session = Depends(get_db)):
         })
 
     # Score histogram (buckets of 10)
-    buckets = []
-    for lo in range(0, 100, 10):
-        hi = lo + 10
-        label = f"{lo}-{hi}"
-        c = (
-            db.query(func.count(RiskAssessment.id))
-            .filter(RiskAssessment.risk_score >= lo, RiskAssessment.risk_score < hi)
-            .scalar()
-        ) or 0
-        buckets.append({"range": label, "count": c})
+    counts = [0] * len(_HISTOGRAM_BUCKETS)
+    for bucket, c in (
+        db.query(_HISTOGRAM_BUCKET, func.count(RiskAssessment.id))
+        .filter(RiskAssessment.risk_score >= 0, RiskAssessment.risk_score < 100)
+        .group_by(_HISTOGRAM_BUCKET)
+    ):
+        counts[bucket] = c
+    buckets = [
+        {"range": f"{lo}-{hi}", "count": c}
+        for (lo, hi), c in zip(_HISTOGRAM_BUCKETS, counts)
+    ]
 
     return {
         "distribution": distribution,
@@ -153,8 +183,8 @@ def risk_distribution(db: Session = Depends(get_db)):
 
 @router.get("/recent-activity")
 def recent_activity(
+    db: DbSession,
     limit: int = Query(default=10, ge=1, le=50),
-    db: Session = Depends(get_db),
 ):
     """
     Return the most recently analysed commits with their risk data.
@@ -162,6 +192,9 @@ def recent_activity(
     """
     assessments = (
         db.query(RiskAssessment)
+        # Commit and repository come back in the same SELECT (both are
+        # many-to-one), instead of two lazy loads per row.
+        .options(joinedload(RiskAssessment.commit).joinedload(Commit.repository))
         .order_by(RiskAssessment.created_at.desc())
         .limit(limit)
         .all()
@@ -194,8 +227,24 @@ def recent_activity(
 # GET /dashboard/commits-with-risk — paginated commit table with risk info
 # ---------------------------------------------------------------------------
 
+def _encode_cursor(created_at: datetime, commit_id: int) -> str:
+    """Opaque keyset cursor for the row ``(created_at, id)``."""
+    raw = f"{created_at.isoformat()}|{commit_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of :func:`_encode_cursor`; raises ``ValidationError`` if malformed."""
+    try:
+        ts, _, commit_id = base64.urlsafe_b64decode(cursor.encode()).decode().partition("|")
+        return datetime.fromisoformat(ts), int(commit_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValidationError("Invalid pagination cursor.") from exc
+
+
 @router.get("/commits-with-risk")
 def commits_with_risk(
+    db: DbSession,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=50, ge=1, le=200),
     risk_level: str = Query(default=None, description="Filter by risk level: LOW, MEDIUM, HIGH"),
@@ -203,13 +252,23 @@ def commits_with_risk(
     sort_order: str = Query(default="desc", description="Sort direction: asc, desc"),
     search: str = Query(default=None, description="Search in commit message or SHA"),
     repo_id: int = Query(default=None, description="Filter by repository ID"),
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Keyset cursor (``next_cursor`` of the previous page); replaces skip for the created_at sort",
+    ),
 ):
     """
     Paginated list of commits with their risk assessments.
 
     Supports sorting by any numeric field, filtering by risk level,
     searching by message/SHA, and filtering by repository.
+
+    With the default ``created_at`` sort every page but the last also
+    returns a ``next_cursor``; passing it back as ``cursor`` seeks straight
+    to the next page via ``(created_at, id)`` instead of scanning ``skip``
+    rows.
+    Cursor pages ignore ``skip`` (reported as 0), and their ``total`` is
+    the full filtered count, which costs a second query on those pages.
     """
     query = db.query(Commit)
 
@@ -237,21 +296,58 @@ def commits_with_risk(
         "lines_added": Commit.lines_added,
     }
     sort_col = sort_map.get(sort_by, Commit.created_at)
+    keyset = sort_col is Commit.created_at
+    descending = sort_order.lower() != "asc"
 
     # If sorting by risk_score, ensure join exists
     if sort_by == "risk_score" and not risk_level:
         query = query.outerjoin(RiskAssessment)
 
-    if sort_order.lower() == "asc":
-        query = query.order_by(sort_col.asc())
+    # id breaks ties so pages never overlap (and is the keyset's second key)
+    if descending:
+        query = query.order_by(sort_col.desc(), Commit.id.desc())
+    else:
+        query = query.order_by(sort_col.asc(), Commit.id.asc())
+
+    page = query.options(
+        selectinload(Commit.repository),
+        selectinload(Commit.risk_assessment),
+    )
+    # The filtered total rides along on every page row as COUNT(*) OVER ()
+    # (evaluated before LIMIT / OFFSET), so no separate count query is run.
+    page = page.add_columns(func.count().over().label("total"))
+    use_cursor = bool(cursor) and keyset
+    if use_cursor:
+        skip = 0
+        after = tuple_(Commit.created_at, Commit.id)
+        bound = _decode_cursor(cursor)
+        page = page.filter(after < bound if descending else after > bound)
+    else:
+        page = page.offset(skip)
+    # One row past the page tells whether a next page exists, so the last
+    # page never hands out a cursor to an empty one.
+    rows = page.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if use_cursor:
+        # The window only sees rows past the cursor, so the full total needs
+        # its own COUNT query (documented above).
+        total = query.count()
+    elif rows:
+        total = rows[0].total
     else:
-        query = query.order_by(sort_col.desc())
+        # Empty page: either nothing matches or skip is past the end.
+        total = query.count() if skip else 0
 
-    total = query.count()
-    commits = query.offset(skip).limit(limit).all()
+    next_cursor = None
+    if keyset and has_more:
+        last = rows[-1][0]
+        if last.created_at is not None:
+            next_cursor = _encode_cursor(last.created_at, last.id)
 
     items = []
-    for c in commits:
+    for c, _ in rows:
         a = c.risk_assessment
         repo = c.repository
         items.append({
@@ -280,4 +376,5 @@ def commits_with_risk(
         "total": total,
         "skip": skip,
         "limit": limit,
+        "next_cursor": next_cursor,
     }
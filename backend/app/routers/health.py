@@ -1,4 +1,7 @@
+import importlib
+import time
 from datetime import datetime
+from functools import cache
 
 from fastapi import APIRouter
 from sqlalchemy import text
@@ -7,24 +10,51 @@ from app.config import get_settings
 from app.database import SessionLocal
 from app.schemas import HealthResponse
 
-# Import the module-level start time set in main.py.
-# We use a lazy import inside the handler to avoid a circular reference at
-# module load time (main imports this router; this router imports main).
-import importlib
-
 router = APIRouter(prefix="/health", tags=["Health"])
 settings = get_settings()
 
 
+@cache
+def _app_start_time() -> float:
+    """
+    The module-level start time set in main.py.
+
+    Imported lazily to avoid a circular reference at module load time
+    (main imports this router; this router imports main), and resolved
+    once rather than on every probe.
+    """
+    main_module = importlib.import_module("app.main")
+    return getattr(main_module, "APP_START_TIME", 0.0)
+
+
+# Last database probe as (expires_at, status).  Uptime checks poll /health
+# every few seconds; reusing the result for _DB_STATUS_TTL_SECONDS keeps them
+# from opening a session and running SELECT 1 each time, while an outage
+# still shows up within that window.
+_DB_STATUS_TTL_SECONDS = 5.0
+_db_status_cache: tuple[float, str] = (0.0, "")
+
+
 def _db_status() -> str:
     """Return 'ok' if the database is reachable, 'unreachable' otherwise."""
+    global _db_status_cache
+
+    now = time.monotonic()
+    expires_at, status = _db_status_cache
+    if now < expires_at:
+        return status
+
+    db = SessionLocal()
     try:
-        db = SessionLocal()
         db.execute(text("SELECT 1"))
-        db.close()
-        return "ok"
+        status = "ok"
     except Exception:
-        return "unreachable"
+        status = "unreachable"
+    finally:
+        db.close()
+
+    _db_status_cache = (now + _DB_STATUS_TTL_SECONDS, status)
+    return status
 
 
 @router.get("", response_model=HealthResponse)
@@ -37,11 +67,7 @@ def health_check():
     - Database connectivity
     - Uptime since process start
     """
-    main_module = importlib.import_module("app.main")
-    start_time: float = getattr(main_module, "APP_START_TIME", 0.0)
-
-    import time
-    uptime = round(time.time() - start_time, 3)
+    uptime = round(time.monotonic() - _app_start_time(), 3)
 
     return HealthResponse(
         status="ok",
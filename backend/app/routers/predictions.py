@@ -1,25 +1,42 @@
-import json
 import logging
 from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Query, status
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from app.config import get_settings
-from app.database import get_db
-from app.exceptions import NotFoundError
+from app.database import IS_SQLITE, DbSession
+from app.exceptions import NotFoundError, ValidationError
 from app.models import Commit, Repository, RiskAssessment, RiskLevel
 from app.schemas import RiskPredictionRequest, RiskPredictionResponse
 from app.ml.predictor import predictor
-from app.services.code_analysis import analyse_commit_files, is_radon_available
+from app.services.code_analysis import (
+    CommitComplexityReport,
+    analyse_commit_files,
+    is_radon_available,
+)
 from app.services.github import fetch_commit_files_content
-from app.services.risk_engine import calculate_risk, extract_features
+from app.services.risk_engine import (
+    CommitFeatures,
+    RiskResult,
+    calculate_risk,
+    extract_features,
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/predictions", tags=["Predictions"])
 settings = get_settings()
 
+# Dialect-specific INSERT, for ON CONFLICT upserts
+_insert = sqlite_insert if IS_SQLITE else pg_insert
+
+# Upper bound on commits accepted by POST /predictions/batch
+_BATCH_MAX_ITEMS = 100
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -110,12 +127,76 @@ def _get_repo_stats(db: Session, repository_id: int) -> dict:
     }
 
 
+def _analyse_complexity(
+    payload: RiskPredictionRequest,
+    repo: Repository,
+    commit: Commit,
+) -> tuple[list[tuple[str, str]], Optional[CommitComplexityReport]]:
+    """
+    Fetch the commit's changed files and run radon over them when requested,
+    persisting the complexity metrics on *commit*.
+
+    Returns ``(changed_files, complexity_report)``; both empty when skipped.
+    """
+    if not (payload.analyze_complexity and is_radon_available()):
+        return [], None
+    parts = repo.full_name.split("/", 1)
+    if len(parts) != 2:
+        return [], None
+
+    owner, repo_name = parts
+    token = settings.github_token_or_none
+    changed_files = fetch_commit_files_content(
+        owner, repo_name, payload.sha, token=token, max_files=20,
+    )
+    if not changed_files:
+        return [], None
+
+    complexity_report = analyse_commit_files(payload.sha, changed_files)
+
+    # Persist complexity on the commit record
+    commit.avg_cyclomatic_complexity = complexity_report.avg_cyclomatic_complexity
+    commit.max_cyclomatic_complexity = complexity_report.max_cyclomatic_complexity
+    commit.avg_maintainability_index = complexity_report.avg_maintainability_index
+    commit.complexity_rank = complexity_report.overall_cc_rank
+    return changed_files, complexity_report
+
+
+def _assessment_values(features: CommitFeatures, result: RiskResult) -> dict:
+    """Column values of a RiskAssessment row, minus ``commit_id``."""
+    return {
+        "risk_score": result.risk_score,
+        "risk_level": result.risk_level,
+        "confidence": result.confidence,
+        "features_json": features.to_dict(),
+        "score_breakdown_json": result.score_breakdown,
+        "model_version": predictor.version,
+    }
+
+
+def _upsert_assessments(db: Session, rows: list[dict]) -> dict[int, RiskAssessment]:
+    """
+    Insert or update the assessment *rows* in one INSERT ... ON CONFLICT
+    (commit_id) DO UPDATE ... RETURNING; ``commit_id`` is unique on
+    risk_assessments.  Returns the persisted rows keyed by ``commit_id``.
+    """
+    stmt = _insert(RiskAssessment).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[RiskAssessment.commit_id],
+        set_={name: stmt.excluded[name] for name in rows[0] if name != "commit_id"},
+    ).returning(RiskAssessment)
+    return {
+        a.commit_id: a
+        for a in db.scalars(stmt, execution_options={"populate_existing": True})
+    }
+
+
 # ---------------------------------------------------------------------------
 # POST /predictions — analyse a commit
 # ---------------------------------------------------------------------------
 
 @router.post("", response_model=RiskPredictionResponse, status_code=status.HTTP_201_CREATED)
-def predict_risk(payload: RiskPredictionRequest, db: Session = Depends(get_db)):
+def predict_risk(payload: RiskPredictionRequest, db: DbSession):
     """
     Analyse a commit and return its risk assessment.
 
@@ -154,25 +235,7 @@ def predict_risk(payload: RiskPredictionRequest, db: Session = Depends(get_db)):
         db.flush()
 
     # ── 2. Complexity analysis (radon) ─────────────────────────────────
-    complexity_report = None
-    changed_files: list[tuple[str, str]] = []
-
-    if payload.analyze_complexity and is_radon_available():
-        parts = repo.full_name.split("/", 1)
-        if len(parts) == 2:
-            owner, repo_name = parts
-            token = settings.github_token_or_none
-            changed_files = fetch_commit_files_content(
-                owner, repo_name, payload.sha, token=token, max_files=20,
-            )
-            if changed_files:
-                complexity_report = analyse_commit_files(payload.sha, changed_files)
-
-                # Persist complexity on the commit record
-                commit.avg_cyclomatic_complexity = complexity_report.avg_cyclomatic_complexity
-                commit.max_cyclomatic_complexity = complexity_report.max_cyclomatic_complexity
-                commit.avg_maintainability_index = complexity_report.avg_maintainability_index
-                commit.complexity_rank = complexity_report.overall_cc_rank
+    changed_files, complexity_report = _analyse_complexity(payload, repo, commit)
 
     # ── 3. Developer & repo stats ──────────────────────────────────────
     dev_stats = _get_developer_stats(db, payload.author_email, repo.id)
@@ -196,41 +259,133 @@ def predict_risk(payload: RiskPredictionRequest, db: Session = Depends(get_db)):
     result = predictor.predict(features)
 
     # ── 6. Upsert assessment ──────────────────────────────────────────
-    assessment = db.query(RiskAssessment).filter(
-        RiskAssessment.commit_id == commit.id
-    ).first()
-
-    features_json = features.to_json()
-    breakdown_json = json.dumps(result.score_breakdown)
-
-    if assessment:
-        assessment.risk_score = result.risk_score
-        assessment.risk_level = result.risk_level
-        assessment.confidence = result.confidence
-        assessment.features_json = features_json
-        assessment.score_breakdown_json = breakdown_json
-        assessment.model_version = predictor.version
-    else:
-        assessment = RiskAssessment(
-            commit_id=commit.id,
-            risk_score=result.risk_score,
-            risk_level=result.risk_level,
-            confidence=result.confidence,
-            features_json=features_json,
-            score_breakdown_json=breakdown_json,
-            model_version=predictor.version,
-        )
-        db.add(assessment)
+    assessment = _upsert_assessments(
+        db, [{"commit_id": commit.id, **_assessment_values(features, result)}]
+    )[commit.id]
 
+    # Serialise while the rows are still loaded, so the commit's expiry
+    # does not cost two refresh SELECTs.
+    response = RiskPredictionResponse(commit=commit, assessment=assessment)
     db.commit()
-    db.refresh(commit)
-    db.refresh(assessment)
 
     logger.info(
         "Risk prediction for %s: score=%.1f level=%s confidence=%.2f",
         payload.sha[:7], result.risk_score, result.risk_level.value, result.confidence,
     )
-    return RiskPredictionResponse(commit=commit, assessment=assessment)
+    return response
+
+
+# ---------------------------------------------------------------------------
+# POST /predictions/batch — analyse many commits at once
+# ---------------------------------------------------------------------------
+
+@router.post("/batch", response_model=list[RiskPredictionResponse], status_code=status.HTTP_201_CREATED)
+def predict_risk_batch(payloads: list[RiskPredictionRequest], db: DbSession):
+    """
+    Analyse up to ``_BATCH_MAX_ITEMS`` commits in one request, e.g. every
+    commit of a push.
+
+    Runs the same pipeline as ``POST /predictions``, but repositories and
+    existing commits are each resolved with one SELECT, new commits are
+    inserted in one flush, the model scores the whole batch as one matrix
+    and the assessments are upserted in one statement.  Developer and
+    repository stats are computed once per author / repository, after the
+    batch's commits are recorded.
+
+    Results follow request order; a commit repeated within the batch is
+    analysed once, from its last entry.
+    """
+    if len(payloads) > _BATCH_MAX_ITEMS:
+        raise ValidationError(f"A batch may contain at most {_BATCH_MAX_ITEMS} commits.")
+    if not payloads:
+        return []
+
+    # ── 1. Resolve repositories ───────────────────────────────────────
+    repos = {
+        r.full_name: r
+        for r in db.scalars(
+            select(Repository).where(
+                Repository.full_name.in_({p.repository_full_name for p in payloads})
+            )
+        )
+    }
+    for p in payloads:
+        if p.repository_full_name not in repos:
+            raise NotFoundError("Repository", p.repository_full_name)
+
+    keys = [(repos[p.repository_full_name].id, p.sha) for p in payloads]
+    latest = dict(zip(keys, payloads))
+
+    # ── 2. Upsert commits ─────────────────────────────────────────────
+    commits = {
+        (c.repository_id, c.sha): c
+        for c in db.scalars(
+            select(Commit).where(tuple_(Commit.repository_id, Commit.sha).in_(list(latest)))
+        )
+    }
+    new_commits = [
+        Commit(
+            sha=p.sha,
+            message=p.commit_message,
+            author_email=p.author_email,
+            lines_added=p.lines_added,
+            lines_deleted=p.lines_deleted,
+            files_changed=p.files_changed,
+            repository_id=repo_id,
+        )
+        for (repo_id, _), p in latest.items()
+        if (repo_id, p.sha) not in commits
+    ]
+    if new_commits:
+        db.add_all(new_commits)
+        db.flush()
+        commits.update(((c.repository_id, c.sha), c) for c in new_commits)
+
+    # ── 3. Complexity, stats and features per commit ──────────────────
+    dev_stats: dict[tuple[Optional[str], int], dict] = {}
+    repo_stats: dict[int, dict] = {}
+    features_list = []
+    for key, p in latest.items():
+        repo_id = key[0]
+        commit = commits[key]
+        changed_files, complexity_report = _analyse_complexity(
+            p, repos[p.repository_full_name], commit
+        )
+        if (p.author_email, repo_id) not in dev_stats:
+            dev_stats[(p.author_email, repo_id)] = _get_developer_stats(db, p.author_email, repo_id)
+        if repo_id not in repo_stats:
+            repo_stats[repo_id] = _get_repo_stats(db, repo_id)
+
+        features_list.append(extract_features(
+            lines_added=p.lines_added,
+            lines_deleted=p.lines_deleted,
+            files_changed=p.files_changed,
+            commit_message=p.commit_message,
+            committed_at=commit.committed_at,
+            author_email=p.author_email,
+            changed_files=changed_files or None,
+            complexity_report=complexity_report,
+            **dev_stats[(p.author_email, repo_id)],
+            **repo_stats[repo_id],
+        ))
+
+    # ── 4. Score and upsert assessments ───────────────────────────────
+    results = predictor.predict_batch(features_list)
+    assessments = _upsert_assessments(db, [
+        {"commit_id": commits[key].id, **_assessment_values(features, result)}
+        for key, features, result in zip(latest, features_list, results)
+    ])
+
+    responses = {
+        key: RiskPredictionResponse(
+            commit=commits[key], assessment=assessments[commits[key].id]
+        )
+        for key in latest
+    }
+    db.commit()
+
+    logger.info("Batch risk prediction: %d commits", len(responses))
+    return [responses[key] for key in keys]
 
 
 # ---------------------------------------------------------------------------
@@ -239,9 +394,9 @@ def predict_risk(payload: RiskPredictionRequest, db: Session = Depends(get_db)):
 
 @router.get("", response_model=list[RiskPredictionResponse])
 def list_predictions(
+    db: DbSession,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=50, ge=1, le=200),
-    db: Session = Depends(get_db),
 ):
     """List all risk assessments, newest first."""
     assessments = (
@@ -295,7 +450,7 @@ def model_info():
 # ---------------------------------------------------------------------------
 
 @router.get("/{commit_sha}", response_model=RiskPredictionResponse)
-def get_prediction(commit_sha: str, db: Session = Depends(get_db)):
+def get_prediction(commit_sha: str, db: DbSession):
     """Retrieve an existing risk assessment by commit SHA."""
     commit = db.query(Commit).filter(Commit.sha == commit_sha).first()
 
@@ -1,10 +1,9 @@
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Query, status
 
 from app.config import get_settings
-from app.database import get_db
+from app.database import DbSession
 from app.exceptions import (
     ConflictError,
     ExternalServiceError,
@@ -93,13 +92,13 @@ def _build_metadata(gh: dict) -> GitHubRepoMetadata:
 # ---------------------------------------------------------------------------
 
 @router.get("", response_model=list[RepositoryResponse])
-def list_repositories(skip: int = 0, limit: int = 20, db: Session = Depends(get_db)):
+def list_repositories(db: DbSession, skip: int = 0, limit: int = 20):
     """List all connected repositories."""
     return db.query(Repository).offset(skip).limit(limit).all()
 
 
 @router.post("", response_model=RepositoryResponse, status_code=status.HTTP_201_CREATED)
-def connect_repository(payload: RepositoryCreate, db: Session = Depends(get_db)):
+def connect_repository(payload: RepositoryCreate, db: DbSession):
     """Connect a new GitHub repository for risk monitoring."""
     existing = db.query(Repository).filter(
         Repository.github_repo_id == payload.github_repo_id
@@ -124,7 +123,7 @@ def connect_repository(payload: RepositoryCreate, db: Session = Depends(get_db))
 
 
 @router.get("/{repo_id}", response_model=RepositoryResponse)
-def get_repository(repo_id: int, db: Session = Depends(get_db)):
+def get_repository(repo_id: int, db: DbSession):
     """Get a single repository by ID."""
     repo = db.query(Repository).filter(Repository.id == repo_id).first()
     if not repo:
@@ -133,7 +132,7 @@ def get_repository(repo_id: int, db: Session = Depends(get_db)):
 
 
 @router.delete("/{repo_id}", response_model=MessageResponse)
-def disconnect_repository(repo_id: int, db: Session = Depends(get_db)):
+def disconnect_repository(repo_id: int, db: DbSession):
     """Disconnect and remove a repository."""
     repo = db.query(Repository).filter(Repository.id == repo_id).first()
     if not repo:
@@ -155,8 +154,8 @@ def disconnect_repository(repo_id: int, db: Session = Depends(get_db)):
     summary="Import a repository by GitHub URL",
 )
 def import_repository(
+    db: DbSession,
     payload: RepoImportRequest,
-    db: Session = Depends(get_db),
 ):
     """
     Accept a GitHub repository URL, fetch its metadata and recent commit
@@ -223,11 +222,11 @@ def import_repository(
     summary="Fetch commit history for a connected repository",
 )
 def get_commit_history(
+    db: DbSession,
     repo_id: int,
     branch: str = Query(default=None, description="Branch name (defaults to repo default branch)"),
     page: int = Query(default=1, ge=1, description="Page number"),
     per_page: int = Query(default=30, ge=1, le=100, description="Commits per page"),
-    db: Session = Depends(get_db),
 ):
     """
     Fetch recent commit history for a connected repository directly from the
@@ -275,11 +274,11 @@ def get_commit_history(
     summary="Sync commit history and metrics into the database",
 )
 def sync_commits(
+    db: DbSession,
     repo_id: int,
     branch: str = Query(default=None, description="Branch (defaults to repo default branch)"),
     limit: int = Query(default=None, ge=1, le=500, description="Max commits to sync (default from settings)"),
     fetch_metrics: bool = Query(default=True, description="Fetch per-commit stats (lines added/deleted, files changed)"),
-    db: Session = Depends(get_db),
 ):
     """
     Fetch the last *N* commits from GitHub, extract per-commit metrics
@@ -337,10 +336,10 @@ def sync_commits(
     summary="List commits stored in the database for a repository",
 )
 def list_stored_commits(
+    db: DbSession,
     repo_id: int,
     skip: int = Query(default=0, ge=0),
     limit: int = Query(default=100, ge=1, le=500),
-    db: Session = Depends(get_db),
 ):
     """
     Return commits that have already been synced to the database.
@@ -3,11 +3,10 @@ import hmac
 import json
 import logging
 
-from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Header, HTTPException, Request, status
 
 from app.config import get_settings
-from app.database import get_db
+from app.database import DbSession
 from app.models import Commit, Repository, RiskAssessment
 from app.services.risk_engine import extract_features
 from app.ml.predictor import predictor
@@ -46,7 +45,7 @@ def _verify_signature(payload: bytes, signature: str) -> bool:
 @router.post("/github", status_code=status.HTTP_200_OK)
 async def github_webhook(
     request: Request,
-    db: Session = Depends(get_db),
+    db: DbSession,
     x_hub_signature_256: str = Header(default=""),
     x_github_event: str = Header(default=""),
 ):
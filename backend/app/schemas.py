@@ -1,7 +1,8 @@
+import json
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, field_validator
 
 from app.models import RiskLevel
 
@@ -132,6 +133,13 @@ class RiskAssessmentResponse(BaseModel):
     class Config:
         from_attributes = True
 
+    @field_validator("features_json", "score_breakdown_json", mode="before")
+    @classmethod
+    def _dump_json_document(cls, v):
+        # Stored as JSON / JSONB (a dict on the ORM side); the API keeps
+        # returning the JSON text clients already parse.
+        return json.dumps(v) if isinstance(v, dict) else v
+
 
 class RiskPredictionResponse(BaseModel):
     commit: CommitResponse
@@ -253,13 +261,18 @@ class GitHubLoginURL(BaseModel):
 # ---------------------------------------------------------------------------
 
 class GitHubUserRepoItem(BaseModel):
-    """A single repository from GET /user/repos."""
+    """
+    A single repository from GET /user/repos.
+
+    Field names match GitHub's keys, so raw API dicts validate directly
+    (unknown keys are ignored).
+    """
     id: int
     name: str
     full_name: str
     description: Optional[str] = None
-    private: bool
-    html_url: str
+    private: bool = False
+    html_url: str = ""
     language: Optional[str] = None
     stargazers_count: int = 0
     forks_count: int = 0
@@ -270,3 +283,8 @@ class GitHubUserRepoItem(BaseModel):
     topics: list[str] = []
     fork: bool = False
     archived: bool = False
+
+    @field_validator("topics", mode="before")
+    @classmethod
+    def _null_topics(cls, v):
+        return [] if v is None else v
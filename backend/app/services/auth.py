@@ -11,11 +11,14 @@ from __future__ import annotations
 
 import base64
 import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
 
 from cryptography.fernet import Fernet, InvalidToken
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
 
 from app.config import get_settings
 
@@ -47,10 +50,49 @@ def decrypt_token(encrypted_token: str) -> str:
         raise ValueError("Could not decrypt access token — invalid or tampered data.") from exc
 
 
+# Plaintext of recently decrypted tokens keyed by ciphertext, so repeat
+# GitHub calls for the same user skip the Fernet HMAC + AES pass.  Entries
+# live for at most _TOKEN_PLAIN_TTL_SECONDS.
+_TOKEN_PLAIN_TTL_SECONDS = 300
+_TOKEN_PLAIN_CACHE_SIZE = 10_000
+_token_plain_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+_token_plain_lock = threading.Lock()
+
+
+def decrypt_token_cached(encrypted_token: str) -> str:
+    """
+    Like :func:`decrypt_token`, but reuses the plaintext of a ciphertext
+    decrypted recently.  Failures are not cached.
+    """
+    now = time.monotonic()
+
+    with _token_plain_lock:
+        hit = _token_plain_cache.get(encrypted_token)
+        if hit is not None:
+            if hit[0] > now:
+                _token_plain_cache.move_to_end(encrypted_token)
+                return hit[1]
+            del _token_plain_cache[encrypted_token]
+
+    plain = decrypt_token(encrypted_token)
+
+    with _token_plain_lock:
+        _token_plain_cache[encrypted_token] = (now + _TOKEN_PLAIN_TTL_SECONDS, plain)
+        if len(_token_plain_cache) > _TOKEN_PLAIN_CACHE_SIZE:
+            _token_plain_cache.popitem(last=False)
+    return plain
+
+
 # ---------------------------------------------------------------------------
 # JWT helpers
 # ---------------------------------------------------------------------------
 
+# Signing key constructed once rather than on every encode / decode
+# (python-jose otherwise rebuilds the HMAC key and tries to JSON-parse the
+# secret as a JWK set per call).
+_jwt_key = jwk.construct(settings.SECRET_KEY, settings.ALGORITHM)
+
+
 def create_access_token(
     subject: int,
     extra_claims: Optional[dict] = None,
@@ -73,7 +115,7 @@ def create_access_token(
     payload: dict = {"sub": str(subject), "exp": expire, "iat": datetime.utcnow()}
     if extra_claims:
         payload.update(extra_claims)
-    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return jwt.encode(payload, _jwt_key, algorithm=settings.ALGORITHM)
 
 
 def decode_access_token(token: str) -> dict:
@@ -86,7 +128,7 @@ def decode_access_token(token: str) -> dict:
     Raises:
         JWTError: if the token is invalid, expired, or tampered.
     """
-    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    return jwt.decode(token, _jwt_key, algorithms=[settings.ALGORITHM])
 
 
 def get_user_id_from_token(token: str) -> int:
@@ -157,3 +199,43 @@ def verify_clerk_token(token: str) -> dict:
         options={"verify_aud": False},
     )
     return payload
+
+
+# Verified claims keyed by a short token digest.  Entries live for at most
+# _CLERK_CLAIMS_TTL_SECONDS and never past the token's own ``exp``.
+_CLERK_CLAIMS_TTL_SECONDS = 60
+_CLERK_CLAIMS_CACHE_SIZE = 10_000
+_clerk_claims_cache: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+_clerk_claims_lock = threading.Lock()
+
+
+def verify_clerk_token_cached(token: str) -> dict:
+    """
+    Like :func:`verify_clerk_token`, but reuses the claims of a token that
+    was verified recently instead of re-checking its RSA signature.
+
+    Raises the same errors as :func:`verify_clerk_token` on a cache miss.
+    """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    now = time.time()
+
+    with _clerk_claims_lock:
+        hit = _clerk_claims_cache.get(key)
+        if hit is not None:
+            if hit[0] > now:
+                _clerk_claims_cache.move_to_end(key)
+                return hit[1]
+            del _clerk_claims_cache[key]
+
+    payload = verify_clerk_token(token)
+
+    expires_at = now + _CLERK_CLAIMS_TTL_SECONDS
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        expires_at = min(expires_at, float(exp))
+
+    with _clerk_claims_lock:
+        _clerk_claims_cache[key] = (expires_at, payload)
+        if len(_clerk_claims_cache) > _CLERK_CLAIMS_CACHE_SIZE:
+            _clerk_claims_cache.popitem(last=False)
+    return payload
@@ -12,6 +12,7 @@ import re
 from typing import Optional
 
 import httpx
+import orjson
 
 from app.exceptions import ExternalServiceError, NotFoundError, ForbiddenError, ValidationError
 
@@ -89,7 +90,7 @@ def fetch_repo_metadata(
         with httpx.Client(timeout=15) as client:
             resp = client.get(url, headers=_default_headers(token))
             resp.raise_for_status()
-            return resp.json()
+            return orjson.loads(resp.content)
     except httpx.HTTPStatusError as exc:
         _handle_github_error(exc, f"Repository '{owner}/{repo}'")
     except httpx.RequestError as exc:
@@ -104,22 +105,48 @@ def fetch_user_repos(
     affiliation: str = "owner,collaborator,organization_member",
 ) -> list[dict]:
     """Fetch the authenticated user's GitHub repositories."""
+    repos, _ = fetch_user_repos_if_changed(
+        token, per_page=per_page, page=page, sort=sort, affiliation=affiliation,
+    )
+    return repos
+
+
+def fetch_user_repos_if_changed(
+    token: str,
+    etag: Optional[str] = None,
+    per_page: int = 100,
+    page: int = 1,
+    sort: str = "updated",
+    affiliation: str = "owner,collaborator,organization_member",
+) -> tuple[Optional[list[dict]], Optional[str]]:
+    """
+    Conditional variant of :func:`fetch_user_repos`.
+
+    Sends ``If-None-Match: <etag>`` when *etag* is given.  Returns
+    ``(None, etag)`` when GitHub answers 304 Not Modified (which does not
+    count against the rate limit), otherwise ``(repos, new_etag)``.
+    """
     params: dict[str, str | int] = {
         "per_page": per_page,
         "page": page,
         "sort": sort,
         "affiliation": affiliation,
     }
+    headers = _default_headers(token)
+    if etag:
+        headers["If-None-Match"] = etag
     logger.debug("Fetching user repos page=%s per_page=%s", page, per_page)
     try:
         with httpx.Client(timeout=15) as client:
             resp = client.get(
                 f"{GITHUB_API}/user/repos",
-                headers=_default_headers(token),
+                headers=headers,
                 params=params,
             )
+            if resp.status_code == 304:
+                return None, etag
             resp.raise_for_status()
-            return resp.json()
+            return orjson.loads(resp.content), resp.headers.get("ETag")
     except httpx.HTTPStatusError as exc:
         _handle_github_error(exc, "user repos")
     except httpx.RequestError as exc:
@@ -153,7 +180,7 @@ def fetch_commit_history(
                 params=params,
             )
             resp.raise_for_status()
-            return resp.json()
+            return orjson.loads(resp.content)
     except httpx.HTTPStatusError as exc:
         _handle_github_error(exc, f"commits for '{owner}/{repo}'")
     except httpx.RequestError as exc:
@@ -179,7 +206,7 @@ def fetch_commit_detail(
         with httpx.Client(timeout=15) as client:
             resp = client.get(url, headers=_default_headers(token))
             resp.raise_for_status()
-            return resp.json()
+            return orjson.loads(resp.content)
     except httpx.HTTPStatusError as exc:
         _handle_github_error(exc, f"commit {sha[:7]}")
     except httpx.RequestError as exc:
@@ -249,7 +276,7 @@ def fetch_file_content(
                 params={"ref": ref},
             )
             resp.raise_for_status()
-            data = resp.json()
+            data = orjson.loads(resp.content)
 
             # GitHub returns base64-encoded content for files < 1 MB
             encoding = data.get("encoding", "")
@@ -17,6 +17,7 @@ import json
 import logging
 import math
 import re
+from bisect import bisect_left, bisect_right
 from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from typing import Optional
@@ -85,8 +86,19 @@ class CommitFeatures:
     risky_keyword_count: int = 0
 
     def to_dict(self) -> dict:
-        """Serialise to a JSON-safe dict for storage in ``features_json``."""
-        return asdict(self)
+        """
+        Serialise to a JSON-safe dict for storage in ``features_json``.
+
+        Non-finite floats (NaN / ±Inf) become ``None``: JSON(B) cannot hold
+        them.  Both the training pipeline and the predictor read ``None`` as
+        a missing value and impute it with the column median, so stored and
+        served features stay identical.
+        """
+        d = asdict(self)
+        for key, value in d.items():
+            if isinstance(value, float) and not math.isfinite(value):
+                d[key] = None
+        return d
 
     def to_json(self) -> str:
         return json.dumps(self.to_dict())
@@ -96,11 +108,11 @@ class CommitFeatures:
 # Feature extraction
 # ═══════════════════════════════════════════════════════════════════════════
 
-_RISKY_KEYWORDS = [
+_RISKY_KEYWORDS = (
     "fix", "hotfix", "urgent", "hack", "workaround", "temp", "wip",
     "revert", "rollback", "patch", "broken", "bug", "crash", "critical",
     "emergency", "quick fix", "dirty", "todo", "fixme",
-]
+)
 
 _TEST_PATTERNS = re.compile(
     r"(test_|_test\.py|tests/|spec/|__tests__|\.test\.|\.spec\.)",
@@ -191,9 +203,9 @@ def extract_features(
     if commit_message:
         f.message_length = len(commit_message)
         msg_lower = commit_message.lower()
-        matches = [kw for kw in _RISKY_KEYWORDS if kw in msg_lower]
-        f.has_risky_keywords = len(matches) > 0
-        f.risky_keyword_count = len(matches)
+        matches = sum(kw in msg_lower for kw in _RISKY_KEYWORDS)
+        f.has_risky_keywords = matches > 0
+        f.risky_keyword_count = matches
 
     # ── Derived features (AI_Model_Engineering.md §6) ──────────────────
     f.code_churn_ratio = round(lines_added / (lines_deleted + 1), 4)
@@ -211,6 +223,22 @@ def extract_features(
 # Rule-based risk scoring  (replaces the old _calculate_risk)
 # ═══════════════════════════════════════════════════════════════════════════
 
+# Step tables for the graded sub-scores.  ``_ABOVE`` ladders award
+# ``points[i - 1]`` once the value exceeds ``bounds[i - 1]`` and fall back to
+# ``value * rate`` below the first bound; the MI ladder is indexed by how many
+# bounds the value has reached.  One bisect replaces each if/elif cascade.
+_VOLUME_BOUNDS, _VOLUME_POINTS = (50, 100, 200, 500, 1000), (5.0, 9.0, 14.0, 20.0, 25.0)
+_CC_BOUNDS, _CC_POINTS = (5, 10, 15, 25), (3.0, 6.0, 9.0, 12.0)
+_SPREAD_BOUNDS, _SPREAD_POINTS = (5, 10, 20, 30), (3.0, 5.0, 7.0, 10.0)
+_MI_BOUNDS, _MI_POINTS = (20, 40, 60, 80), (8.0, 6.0, 4.0, 2.0, 0.0)
+
+
+def _above(value: float, bounds: tuple, points: tuple, rate: float) -> float:
+    """Points for the highest bound *value* exceeds, else ``value * rate``."""
+    i = bisect_left(bounds, value)
+    return points[i - 1] if i else max(0.0, value * rate)
+
+
 @dataclass
 class RiskResult:
     """Output of the rule-based scorer."""
@@ -253,49 +281,15 @@ def calculate_risk(features: CommitFeatures) -> RiskResult:
     breakdown: dict[str, float] = {}
 
     # ─── 1. Code Volume  (max 25) ─────────────────────────────────────
-    total = features.total_lines_changed
-    if total > 1000:
-        vol = 25.0
-    elif total > 500:
-        vol = 20.0
-    elif total > 200:
-        vol = 14.0
-    elif total > 100:
-        vol = 9.0
-    elif total > 50:
-        vol = 5.0
-    else:
-        vol = max(0.0, total * 0.05)
+    vol = _above(features.total_lines_changed, _VOLUME_BOUNDS, _VOLUME_POINTS, 0.05)
     breakdown["code_volume"] = round(vol, 2)
 
     # ─── 2. Code Complexity — radon  (max 20) ─────────────────────────
-    cc = features.avg_cyclomatic_complexity
-    mi = features.avg_maintainability_index
-    comp_score = 0.0
-
     # CC contribution (0-12)
-    if cc > 25:
-        comp_score += 12.0
-    elif cc > 15:
-        comp_score += 9.0
-    elif cc > 10:
-        comp_score += 6.0
-    elif cc > 5:
-        comp_score += 3.0
-    else:
-        comp_score += max(0.0, cc * 0.4)
+    comp_score = _above(features.avg_cyclomatic_complexity, _CC_BOUNDS, _CC_POINTS, 0.4)
 
     # MI contribution (0-8) — lower MI = higher risk
-    if mi < 20:
-        comp_score += 8.0
-    elif mi < 40:
-        comp_score += 6.0
-    elif mi < 60:
-        comp_score += 4.0
-    elif mi < 80:
-        comp_score += 2.0
-    else:
-        comp_score += 0.0
+    comp_score += _MI_POINTS[bisect_right(_MI_BOUNDS, features.avg_maintainability_index)]
 
     breakdown["code_complexity"] = round(min(comp_score, 20.0), 2)
 
@@ -343,17 +337,7 @@ def calculate_risk(features: CommitFeatures) -> RiskResult:
     breakdown["temporal_risk"] = round(min(time_score, 10.0), 2)
 
     # ─── 6. File Spread  (max 10) ──────────────────────────────────────
-    fc = features.files_changed
-    if fc > 30:
-        spread = 10.0
-    elif fc > 20:
-        spread = 7.0
-    elif fc > 10:
-        spread = 5.0
-    elif fc > 5:
-        spread = 3.0
-    else:
-        spread = max(0.0, fc * 0.4)
+    spread = _above(features.files_changed, _SPREAD_BOUNDS, _SPREAD_POINTS, 0.4)
 
     # Bonus: many file types = cross-cutting change
     if features.file_types_count > 5:
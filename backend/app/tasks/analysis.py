@@ -7,7 +7,6 @@ so that the HTTP response returns immediately while the heavy lifting
 worker process.
 """
 
-import json
 import logging
 
 from app.celery_app import celery
@@ -103,8 +102,8 @@ def analyze_commit(self, commit_id: int, repo_full_name: str) -> dict:
         result = predictor.predict(features)
 
         # ── 4. Persist assessment ─────────────────────────────────────
-        features_json = features.to_json()
-        breakdown_json = json.dumps(result.score_breakdown)
+        features_json = features.to_dict()
+        breakdown_json = result.score_breakdown
 
         assessment = (
             db.query(RiskAssessment)
@@ -0,0 +1,32 @@
+"""Shared fixtures: a throwaway SQLite database and an app test client."""
+import os
+import tempfile
+
+# Must be set before anything imports app.config / app.database.
+_DB_DIR = tempfile.mkdtemp(prefix="risk-predictor-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    from app.main import app
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def db():
+    """A session on freshly created, empty tables."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
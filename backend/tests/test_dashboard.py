@@ -0,0 +1,64 @@
+"""Tests for the keyset pagination of GET /api/v1/dashboard/commits-with-risk."""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import Commit
+
+URL = "/api/v1/dashboard/commits-with-risk"
+
+
+@pytest.fixture
+def shas(client, db):
+    """Six commits, one minute apart; returned newest first."""
+    r = client.post(
+        "/api/v1/repositories",
+        json={"github_repo_id": 1, "name": "r", "full_name": "o/r"},
+    )
+    assert r.status_code == 201
+    start = datetime(2026, 1, 1)
+    db.add_all(
+        Commit(sha=f"sha{i}", repository_id=r.json()["id"],
+               created_at=start + timedelta(minutes=i))
+        for i in range(6)
+    )
+    db.commit()
+    return [f"sha{i}" for i in reversed(range(6))]
+
+
+def _walk(client, **params) -> list[dict]:
+    pages = [client.get(URL, params={"limit": 2, **params}).json()]
+    while pages[-1]["next_cursor"]:
+        pages.append(client.get(URL, params={
+            "limit": 2, "cursor": pages[-1]["next_cursor"], **params,
+        }).json())
+    return pages
+
+
+def test_cursor_round_trip_visits_every_commit_once(client, shas):
+    pages = _walk(client)
+
+    assert [len(p["items"]) for p in pages] == [2, 2, 2]
+    assert [i["sha"] for p in pages for i in p["items"]] == shas
+    assert all(p["total"] == 6 for p in pages)
+    assert all(p["skip"] == 0 for p in pages)
+
+
+def test_cursor_round_trip_ascending(client, shas):
+    pages = _walk(client, sort_order="asc")
+
+    assert [i["sha"] for p in pages for i in p["items"]] == shas[::-1]
+
+
+def test_last_page_has_no_cursor(client, shas):
+    page = client.get(URL, params={"limit": 6}).json()
+
+    assert len(page["items"]) == 6
+    assert page["next_cursor"] is None
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "bm8tc2VwYXJhdG9y"])
+def test_invalid_cursor_is_422(client, shas, cursor):
+    r = client.get(URL, params={"cursor": cursor})
+
+    assert r.status_code == 422
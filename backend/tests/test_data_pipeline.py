@@ -0,0 +1,66 @@
+"""Tests for the feature-matrix construction in app.ml.data_pipeline."""
+import math
+
+import numpy as np
+
+from app.ml.data_pipeline import (
+    FEATURE_COLUMNS,
+    MedianImputer,
+    build_feature_matrix,
+    export_to_csv,
+)
+
+
+def _sample(features: dict, label: int = 0) -> dict:
+    return {"sha": f"sha{label}{len(features)}", "label": label, "features": features}
+
+
+def test_missing_features_become_nan_for_imputation():
+    nan_col, none_col, absent_col = FEATURE_COLUMNS[0], FEATURE_COLUMNS[1], FEATURE_COLUMNS[2]
+    features = {col: 3.0 for col in FEATURE_COLUMNS}
+    features[nan_col] = math.nan
+    features[none_col] = None
+    del features[absent_col]
+
+    X, _, _ = build_feature_matrix([_sample(features)])
+
+    assert np.isnan(X[0, FEATURE_COLUMNS.index(nan_col)])
+    assert np.isnan(X[0, FEATURE_COLUMNS.index(none_col)])
+    assert np.isnan(X[0, FEATURE_COLUMNS.index(absent_col)])
+
+
+def test_nan_feature_is_imputed_with_column_median():
+    col = FEATURE_COLUMNS[0]
+    samples = [
+        _sample({col: value}, label=i % 2)
+        for i, value in enumerate([1.0, 5.0, 9.0, math.nan, None])
+    ]
+
+    X, _, _ = build_feature_matrix(samples)
+    X = MedianImputer().fit(X).transform(X)
+
+    # median of (1, 5, 9) — the NaN and the None row are both imputed
+    assert X[3, 0] == np.float32(5.0)
+    assert X[4, 0] == np.float32(5.0)
+
+
+def test_booleans_become_zero_one():
+    X, _, _ = build_feature_matrix([
+        _sample({"weekend_flag": True, "has_risky_keywords": False}),
+    ])
+
+    assert X[0, FEATURE_COLUMNS.index("weekend_flag")] == 1.0
+    assert X[0, FEATURE_COLUMNS.index("has_risky_keywords")] == 0.0
+
+
+def test_csv_export_keeps_large_counts_and_blank_missing_values(tmp_path):
+    features = {col: 1 for col in FEATURE_COLUMNS}
+    features["lines_added"] = 16777217  # 2**24 + 1, not representable in float32
+    features["lines_deleted"] = None
+
+    path = export_to_csv([_sample(features)], tmp_path / "samples.csv")
+
+    header, row = path.read_text(encoding="utf-8").splitlines()
+    cells = dict(zip(header.split(","), row.split(",")))
+    assert cells["lines_added"] == "16777217"
+    assert cells["lines_deleted"] == ""
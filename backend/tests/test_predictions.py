@@ -0,0 +1,103 @@
+"""Tests for POST /api/v1/predictions/batch."""
+import json
+
+import pytest
+
+from app.models import Commit, Repository
+from app.routers.predictions import _BATCH_MAX_ITEMS
+
+BATCH_URL = "/api/v1/predictions/batch"
+
+
+@pytest.fixture
+def repo(client, db):
+    r = client.post(
+        "/api/v1/repositories",
+        json={"github_repo_id": 1, "name": "r", "full_name": "o/r"},
+    )
+    assert r.status_code == 201
+    return db.get(Repository, r.json()["id"])
+
+
+def _payload(sha: str, lines_added: int = 10, **extra) -> dict:
+    return {
+        "sha": sha,
+        "repository_full_name": "o/r",
+        "lines_added": lines_added,
+        "commit_message": f"change {sha}",
+        "author_email": "dev@example.com",
+        "analyze_complexity": False,
+        **extra,
+    }
+
+
+def _features(item: dict) -> dict:
+    return json.loads(item["assessment"]["features_json"])
+
+
+def test_batch_over_the_cap_is_rejected(client, repo):
+    payloads = [_payload(f"sha{i}") for i in range(_BATCH_MAX_ITEMS + 1)]
+
+    r = client.post(BATCH_URL, json=payloads)
+
+    assert r.status_code == 422
+
+
+def test_batch_at_the_cap_is_accepted(client, repo):
+    payloads = [_payload(f"sha{i}") for i in range(_BATCH_MAX_ITEMS)]
+
+    r = client.post(BATCH_URL, json=payloads)
+
+    assert r.status_code == 201
+    assert len(r.json()) == _BATCH_MAX_ITEMS
+
+
+def test_unknown_repository_is_404(client, repo):
+    r = client.post(BATCH_URL, json=[
+        _payload("a"),
+        _payload("b", repository_full_name="nobody/nothing"),
+    ])
+
+    assert r.status_code == 404
+
+
+def test_results_follow_request_order(client, repo):
+    shas = ["c", "a", "b"]
+
+    r = client.post(BATCH_URL, json=[_payload(sha) for sha in shas])
+
+    assert r.status_code == 201
+    assert [item["commit"]["sha"] for item in r.json()] == shas
+
+
+def test_repeated_commit_is_analysed_once_from_its_last_entry(client, repo, db):
+    r = client.post(BATCH_URL, json=[
+        _payload("dup", lines_added=1),
+        _payload("other"),
+        _payload("dup", lines_added=300),
+    ])
+
+    assert r.status_code == 201
+    items = r.json()
+    assert [item["commit"]["sha"] for item in items] == ["dup", "other", "dup"]
+    assert items[0] == items[2]
+    assert _features(items[0])["lines_added"] == 300
+    assert db.query(Commit).filter_by(sha="dup").count() == 1
+
+
+def test_existing_commit_keeps_stored_fields(client, repo, db):
+    db.add(Commit(
+        sha="old", message="original message", lines_added=5,
+        repository_id=repo.id,
+    ))
+    db.commit()
+
+    r = client.post(BATCH_URL, json=[
+        _payload("old", lines_added=500, commit_message="new message"),
+    ])
+
+    assert r.status_code == 201
+    (item,) = r.json()
+    assert item["commit"]["lines_added"] == 5
+    assert item["commit"]["message"] == "original message"
+    assert _features(item)["lines_added"] == 500